@@ -2,31 +2,40 @@
 AI Agent Module - Smart Assistant with OpenAI Integration
 Handles natural language processing and intelligent task management
 """
+import re
 import json
+import time
+import asyncio
 import datetime
-from typing import Dict, List, Optional
-from groq import Groq
+import functools
+import itertools
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sized, Tuple
+import dateparser
+import orjson
+from groq import Groq, AsyncGroq
 from config import GROQ_API_KEY
 
+# Maximum number of user messages packed into a single batch analysis call
+BATCH_SIZE = 8
 
-class AIAgent:
-    """Smart AI Assistant for task and event management"""
-    
-    def __init__(self):
-        self.client = Groq(api_key=GROQ_API_KEY)
-        self.conversation_history = []
-    
-    def analyze_user_request(self, user_message: str) -> Dict:
-        """
-        Analyze user's natural language request and determine the action
-        
-        Args:
-            user_message: The user's message
-        
-        Returns:
-            Dictionary containing action type and extracted parameters
-        """
-        system_prompt = """You are a smart calendar and task management assistant. 
+# Maximum number of analyzed user messages kept in the analysis cache
+ANALYSIS_CACHE_SIZE = 1024
+
+# Seconds an analysis is reused when its parameters hold times worked out from
+# the current time ("in 2 hours"); other analyses are reused for the whole day
+ANALYSIS_TIME_TTL = 120
+
+# Analysis parameters whose values depend on the time the message was analyzed
+_TIME_PARAMS = ("start_time", "end_time")
+
+# Matches a JSON object or array wrapped in a markdown code block
+_FENCE_RE = re.compile(r'```(?:json)?\s*([\[{].*[\]}])\s*```', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
+
+# Static system prompts are kept byte-identical across calls so the provider
+# can reuse their cached prefix; the current time is sent as a separate message.
+_ANALYZE_SYSTEM_PROMPT = """You are a smart calendar and task management assistant. 
 Analyze the user's message and extract:
 1. Action type: create_event, list_events, update_event, delete_event, search_events, get_date_events, general_chat
 2. Event details if applicable: title, start_time, end_time, description, location, date
@@ -49,77 +58,340 @@ Return ONLY a valid JSON object with the following structure:
     }
 }
 
-Current date and time: """ + datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """
-
 Examples:
 - "Schedule a meeting tomorrow at 2pm for 1 hour" -> create_event with calculated times
 - "What's on my calendar today?" -> get_date_events with today's date
 - "Show my upcoming events" -> list_events
 - "Cancel my dentist appointment" -> search_events to find it, then delete
 """
+
+_RESPONSE_SYSTEM_PROMPT = """You are a helpful, friendly calendar and task management assistant. 
+You help users manage their schedules, events, and tasks. Be concise but friendly."""
+
+# Shared Groq clients, created on first use so every AIAgent reuses the same
+# HTTP connection pool instead of opening a new one per instance
+_client: Optional[Groq] = None
+_aclient: Optional[AsyncGroq] = None
+
+# LRU cache of (expiry, serialized analysis) keyed by (message, date), shared by
+# the sync and async paths so a repeated message skips the LLM call entirely
+_analysis_cache: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_event_block(summary, start, description, location, link) -> str:
+    """Format one event's display block without its list number; views share the cache"""
+    # Try to format the datetime nicely
+    if start and 'T' in start:
+        try:
+            dt = datetime.datetime.fromisoformat(start.replace('Z', '+00:00'))
+            start = dt.strftime('%B %d, %Y at %I:%M %p')
+        except ValueError:
+            pass
+    
+    chunk = [f"📌 {summary}\n", f"   ⏰ {start}\n"]
+    if description:
+        chunk.append(f"   📝 {description}\n")
+    if location:
+        chunk.append(f"   📍 {location}\n")
+    if link:
+        chunk.append(f"   🔗 {link}\n")
+    chunk.append("\n")
+    return "".join(chunk)
+
+
+def _get_client() -> Groq:
+    """Return the process-wide synchronous Groq client"""
+    global _client
+    if _client is None:
+        _client = Groq(api_key=GROQ_API_KEY)
+    return _client
+
+
+def _get_aclient() -> AsyncGroq:
+    """Return the process-wide asynchronous Groq client"""
+    global _aclient
+    if _aclient is None:
+        _aclient = AsyncGroq(api_key=GROQ_API_KEY)
+    return _aclient
+
+
+class AIAgent:
+    """Smart AI Assistant for task and event management"""
+    
+    def __init__(self):
+        self.client = _get_client()
+        self.aclient = _get_aclient()
+        self.conversation_history = []
+    
+    def _timestamp_message(self, now: datetime.datetime) -> Dict:
+        """Build the system message carrying the current date and time"""
+        return {
+            "role": "system",
+            "content": "Current date and time: " + now.strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
+    def _analyze_request_kwargs(self, user_message: str, now: datetime.datetime) -> Dict:
+        """Build the chat completion arguments for request analysis"""
+        return {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {"role": "system", "content": _ANALYZE_SYSTEM_PROMPT},
+                self._timestamp_message(now),
+                {"role": "user", "content": user_message}
+            ],
+            # Deterministic output so cached analyses match what a fresh call returns
+            "temperature": 0,
+            # Action objects stay well under 200 tokens; stop before any trailing commentary
+            "max_tokens": 200,
+            "stop": ["\n\n\n"]
+        }
+    
+    def _analyze_batch_kwargs(self, user_messages: List[str], now: datetime.datetime) -> Dict:
+        """Build the chat completion arguments for analyzing several messages at once"""
+        batch_instructions = f"""You will receive {len(user_messages)} numbered user messages.
+Return ONLY a valid JSON array with exactly {len(user_messages)} objects in the structure above.
+Element i of the array must correspond to message i."""
+        numbered = "\n".join(f"{i}. {message}" for i, message in enumerate(user_messages, 1))
         
+        return {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {"role": "system", "content": _ANALYZE_SYSTEM_PROMPT},
+                self._timestamp_message(now),
+                {"role": "system", "content": batch_instructions},
+                {"role": "user", "content": numbered}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 300 * len(user_messages)
+        }
+    
+    def _extract_json(self, result: str):
+        """Decode the first JSON value in a model response, ignoring code fences and surrounding text"""
+        match = _FENCE_RE.search(result)
+        payload = match.group(1) if match else result
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if result.startswith("```json"):
-                result = result[7:]
-            if result.startswith("```"):
-                result = result[3:]
-            if result.endswith("```"):
-                result = result[:-3]
-            
-            result = result.strip()
-            
-            parsed_result = json.loads(result)
-            return parsed_result
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            pass
+        # Fall back to decoding the first value when the payload has surrounding text
+        start = next((i for i, ch in enumerate(payload) if ch in '{['), 0)
+        parsed, _ = _JSON_DECODER.raw_decode(payload, start)
+        return parsed
+    
+    def _parse_batch_analysis(self, result: str, expected: int) -> Optional[List[Dict]]:
+        """Parse a JSON array of analyses, returning None if it doesn't line up with the input"""
+        try:
+            parsed = self._extract_json(result)
+        except ValueError as e:
+            print(f"JSON parsing error in batch analysis: {e}")
+            return None
+        
+        if not isinstance(parsed, list) or len(parsed) != expected:
+            print(f"Batch analysis returned {len(parsed) if isinstance(parsed, list) else 'no'} results for {expected} messages")
+            return None
+        if not all(isinstance(item, dict) for item in parsed):
+            return None
         
-        except json.JSONDecodeError as e:
+        return parsed
+    
+    def _parse_analysis(self, result: str) -> Optional[Dict]:
+        """Parse the model's JSON analysis, returning None if it isn't a JSON object"""
+        try:
+            parsed = self._extract_json(result)
+        except ValueError as e:
             print(f"JSON parsing error: {e}")
             print(f"Response was: {result}")
-            return {
-                "action": "general_chat",
-                "parameters": {
-                    "response_text": "I'm sorry, I couldn't understand that request. Could you please rephrase it?"
-                }
+            return None
+        if not isinstance(parsed, dict):
+            print(f"Analysis was not a JSON object: {result}")
+            return None
+        return parsed
+    
+    def _unparsed_analysis(self) -> Dict:
+        """Build the general chat action returned when the model's analysis can't be parsed"""
+        return {
+            "action": "general_chat",
+            "parameters": {
+                "response_text": "I'm sorry, I couldn't understand that request. Could you please rephrase it?"
             }
-        except Exception as e:
-            print(f"Error analyzing request: {e}")
-            return {
-                "action": "error",
-                "parameters": {
-                    "response_text": f"An error occurred: {str(e)}"
-                }
+        }
+    
+    def _analysis_cache_key(self, user_message: str, now: datetime.datetime) -> Tuple[str, str]:
+        """
+        Build the cache key for a message
+        
+        Case and surrounding whitespace are ignored so trivial variations share an
+        entry; the date keeps relative phrases like "today" correct.
+        """
+        return user_message.strip().lower(), now.date().isoformat()
+    
+    def _get_cached_analysis(self, key: Tuple[str, str]) -> Optional[Dict]:
+        """Return a fresh copy of a cached analysis, or None on a miss or once it has expired"""
+        cached = _analysis_cache.get(key)
+        if cached is None:
+            return None
+        expires_at, blob = cached
+        if expires_at <= time.monotonic():
+            del _analysis_cache[key]
+            return None
+        _analysis_cache.move_to_end(key)
+        return orjson.loads(blob)
+    
+    def _store_analysis(self, key: Tuple[str, str], analysis: Dict):
+        """
+        Cache an analysis, evicting the least recently used entry when full
+        
+        Errors and general chat replies are not cached, so a failed call or a
+        conversational answer is never replayed; analyses holding times worked
+        out from the current time expire after ANALYSIS_TIME_TTL seconds.
+        """
+        if analysis.get("action") in ("error", "general_chat"):
+            return
+        params = analysis.get("parameters")
+        if isinstance(params, dict) and any(params.get(name) for name in _TIME_PARAMS):
+            expires_at = time.monotonic() + ANALYSIS_TIME_TTL
+        else:
+            expires_at = float("inf")
+        _analysis_cache[key] = (expires_at, orjson.dumps(analysis))
+        _analysis_cache.move_to_end(key)
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    
+    def _analysis_error(self, error: Exception) -> Dict:
+        """Build the action returned when request analysis fails"""
+        print(f"Error analyzing request: {error}")
+        return {
+            "action": "error",
+            "parameters": {
+                "response_text": f"An error occurred: {str(error)}"
             }
+        }
     
-    def generate_response(self, user_message: str, context: Optional[str] = None) -> str:
+    def analyze_user_request(self, user_message: str, now: Optional[datetime.datetime] = None) -> Dict:
         """
-        Generate a natural language response
+        Analyze user's natural language request and determine the action
         
         Args:
             user_message: The user's message
-            context: Additional context for the response
+            now: Current time to reason about; defaults to datetime.datetime.now()
         
         Returns:
-            AI-generated response
+            Dictionary containing action type and extracted parameters
         """
+        now = now or datetime.datetime.now()
+        
+        key = self._analysis_cache_key(user_message, now)
+        cached = self._get_cached_analysis(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = self.client.chat.completions.create(**self._analyze_request_kwargs(user_message, now))
+            analysis = self._parse_analysis(response.choices[0].message.content)
+        except Exception as e:
+            return self._analysis_error(e)
+        if analysis is None:
+            return self._unparsed_analysis()
+        
+        self._store_analysis(key, analysis)
+        return analysis
+    
+    async def aanalyze_user_request(self, user_message: str, now: Optional[datetime.datetime] = None) -> Dict:
+        """
+        Async version of analyze_user_request
+        
+        Args:
+            user_message: The user's message
+            now: Current time to reason about; defaults to datetime.datetime.now()
+        
+        Returns:
+            Dictionary containing action type and extracted parameters
+        """
+        now = now or datetime.datetime.now()
+        
+        key = self._analysis_cache_key(user_message, now)
+        cached = self._get_cached_analysis(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.aclient.chat.completions.create(**self._analyze_request_kwargs(user_message, now))
+            analysis = self._parse_analysis(response.choices[0].message.content)
+        except Exception as e:
+            return self._analysis_error(e)
+        if analysis is None:
+            return self._unparsed_analysis()
+        
+        self._store_analysis(key, analysis)
+        return analysis
+    
+    def analyze_user_requests_batch(self, user_messages: List[str], now: Optional[datetime.datetime] = None) -> List[Dict]:
+        """
+        Analyze several user messages with one LLM call per batch of up to BATCH_SIZE
+        
+        Args:
+            user_messages: The user messages to analyze
+            now: Current time to reason about; defaults to datetime.datetime.now()
+        
+        Returns:
+            List of analysis dictionaries, one per message and in the same order
+        """
+        now = now or datetime.datetime.now()
+        
+        results = []
+        for start in range(0, len(user_messages), BATCH_SIZE):
+            batch = user_messages[start:start + BATCH_SIZE]
+            parsed = None
+            try:
+                response = self.client.chat.completions.create(**self._analyze_batch_kwargs(batch, now))
+                parsed = self._parse_batch_analysis(response.choices[0].message.content, len(batch))
+            except Exception as e:
+                print(f"Error analyzing batch: {e}")
+            
+            # Fall back to one call per message if the batch didn't line up
+            if parsed is None:
+                parsed = [self.analyze_user_request(message, now) for message in batch]
+            results.extend(parsed)
+        
+        return results
+    
+    async def _aanalyze_batch(self, batch: List[str], now: datetime.datetime) -> List[Dict]:
+        """Analyze a single batch asynchronously, falling back to per-message calls"""
+        try:
+            response = await self.aclient.chat.completions.create(**self._analyze_batch_kwargs(batch, now))
+            parsed = self._parse_batch_analysis(response.choices[0].message.content, len(batch))
+            if parsed is not None:
+                return parsed
+        except Exception as e:
+            print(f"Error analyzing batch: {e}")
+        
+        return list(await asyncio.gather(*(self.aanalyze_user_request(message, now) for message in batch)))
+    
+    async def aanalyze_user_requests_batch(self, user_messages: List[str], now: Optional[datetime.datetime] = None) -> List[Dict]:
+        """
+        Async version of analyze_user_requests_batch; all batches run concurrently
+        
+        Args:
+            user_messages: The user messages to analyze
+            now: Current time to reason about; defaults to datetime.datetime.now()
+        
+        Returns:
+            List of analysis dictionaries, one per message and in the same order
+        """
+        now = now or datetime.datetime.now()
+        
+        batches = await asyncio.gather(*(
+            self._aanalyze_batch(user_messages[start:start + BATCH_SIZE], now)
+            for start in range(0, len(user_messages), BATCH_SIZE)
+        ))
+        return [analysis for batch in batches for analysis in batch]
+    
+    def _response_kwargs(self, user_message: str, context: Optional[str], now: datetime.datetime) -> Dict:
+        """Build the chat completion arguments for a conversational response"""
         messages = [
-            {
-                "role": "system",
-                "content": """You are a helpful, friendly calendar and task management assistant. 
-You help users manage their schedules, events, and tasks. Be concise but friendly.
-Current date and time: """ + datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            {"role": "system", "content": _RESPONSE_SYSTEM_PROMPT},
+            self._timestamp_message(now)
         ]
         
         if context:
@@ -127,19 +399,118 @@ Current date and time: """ + datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S
         
         messages.append({"role": "user", "content": user_message})
         
+        return {
+            "model": "llama-3.3-70b-versatile",
+            "messages": messages,
+            "temperature": 0.8,
+            "max_tokens": 300
+        }
+    
+    def generate_response(self, user_message: str, context: Optional[str] = None, now: Optional[datetime.datetime] = None) -> str:
+        """
+        Generate a natural language response
+        
+        Args:
+            user_message: The user's message
+            context: Additional context for the response
+            now: Current time to reason about; defaults to datetime.datetime.now()
+        
+        Returns:
+            AI-generated response
+        """
+        now = now or datetime.datetime.now()
+        
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=messages,
-                temperature=0.8,
-                max_tokens=300
-            )
-            
+            response = self.client.chat.completions.create(**self._response_kwargs(user_message, context, now))
             return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error generating response: {e}")
             return "I'm having trouble generating a response right now. Please try again."
     
+    async def agenerate_response(self, user_message: str, context: Optional[str] = None, now: Optional[datetime.datetime] = None) -> str:
+        """
+        Async version of generate_response
+        
+        Args:
+            user_message: The user's message
+            context: Additional context for the response
+            now: Current time to reason about; defaults to datetime.datetime.now()
+        
+        Returns:
+            AI-generated response
+        """
+        now = now or datetime.datetime.now()
+        
+        try:
+            response = await self.aclient.chat.completions.create(**self._response_kwargs(user_message, context, now))
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Error generating response: {e}")
+            return "I'm having trouble generating a response right now. Please try again."
+    
+    async def agenerate_response_stream(self, user_message: str, context: Optional[str] = None, now: Optional[datetime.datetime] = None) -> AsyncIterator[str]:
+        """
+        Stream a natural language response as it is generated
+        
+        Args:
+            user_message: The user's message
+            context: Additional context for the response
+            now: Current time to reason about; defaults to datetime.datetime.now()
+        
+        Yields:
+            Chunks of the AI-generated response
+        """
+        now = now or datetime.datetime.now()
+        
+        try:
+            stream = await self.aclient.chat.completions.create(
+                **self._response_kwargs(user_message, context, now),
+                stream=True
+            )
+            async for chunk in stream:
+                yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            print(f"Error streaming response: {e}")
+            yield "I'm having trouble generating a response right now. Please try again."
+    
+    def _parse_datetime_kwargs(self, time_description: str, reference_date: datetime.datetime) -> Dict:
+        """Build the chat completion arguments for datetime parsing"""
+        system_prompt = f"""Convert the time description to ISO format datetime.
+Current datetime: {reference_date.isoformat()}
+Return ONLY a JSON object of the form {{"iso": "ISO format datetime"}}, nothing else.
+Examples:
+- "tomorrow at 2pm" -> {{"iso": "{(reference_date + datetime.timedelta(days=1)).replace(hour=14, minute=0, second=0).isoformat()}"}}
+- "in 2 hours" -> {{"iso": "{(reference_date + datetime.timedelta(hours=2)).isoformat()}"}}
+- "next Monday at 10am" -> calculate the next Monday and set time to 10:00
+"""
+        
+        return {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": time_description}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0,
+            "max_tokens": 40
+        }
+    
+    def _parse_datetime_response(self, content: str) -> datetime.datetime:
+        """Read the datetime out of a JSON-mode {"iso": ...} response"""
+        datetime_str = orjson.loads(content)["iso"].strip()
+        return datetime.datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+    
+    def _parse_datetime_locally(self, time_description: str, reference_date: datetime.datetime) -> Optional[datetime.datetime]:
+        """Parse common phrasings ("tomorrow at 2pm", "in 2 hours") without an LLM call"""
+        try:
+            return dateparser.parse(
+                time_description,
+                settings={'RELATIVE_BASE': reference_date, 'PREFER_DATES_FROM': 'future'}
+            )
+        except Exception as e:
+            print(f"Error parsing datetime locally: {e}")
+            return None
+    
     def parse_datetime(self, time_description: str, reference_date: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
         """
         Parse natural language time description into datetime
@@ -154,33 +525,81 @@ Current date and time: """ + datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S
         if reference_date is None:
             reference_date = datetime.datetime.now()
         
-        system_prompt = f"""Convert the time description to ISO format datetime.
-Current datetime: {reference_date.isoformat()}
-Return ONLY the ISO format datetime string, nothing else.
-Examples:
-- "tomorrow at 2pm" -> {(reference_date + datetime.timedelta(days=1)).replace(hour=14, minute=0, second=0).isoformat()}
-- "in 2 hours" -> {(reference_date + datetime.timedelta(hours=2)).isoformat()}
-- "next Monday at 10am" -> calculate the next Monday and set time to 10:00
-"""
+        # Only fall back to the LLM for phrasings the local parser can't handle
+        parsed = self._parse_datetime_locally(time_description, reference_date)
+        if parsed is not None:
+            return parsed
         
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": time_description}
-                ],
-                temperature=0.3,
-                max_tokens=100
-            )
-            
-            datetime_str = response.choices[0].message.content.strip()
-            return datetime.datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+            response = self.client.chat.completions.create(**self._parse_datetime_kwargs(time_description, reference_date))
+            return self._parse_datetime_response(response.choices[0].message.content)
+        
+        except Exception as e:
+            print(f"Error parsing datetime: {e}")
+            return None
+    
+    async def aparse_datetime(self, time_description: str, reference_date: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+        """
+        Async version of parse_datetime
+        
+        Args:
+            time_description: Natural language time (e.g., "tomorrow at 2pm", "next Monday at 10am")
+            reference_date: Reference date for relative times
+        
+        Returns:
+            Parsed datetime object
+        """
+        if reference_date is None:
+            reference_date = datetime.datetime.now()
+        
+        # Only fall back to the LLM for phrasings the local parser can't handle
+        parsed = self._parse_datetime_locally(time_description, reference_date)
+        if parsed is not None:
+            return parsed
+        
+        try:
+            response = await self.aclient.chat.completions.create(**self._parse_datetime_kwargs(time_description, reference_date))
+            return self._parse_datetime_response(response.choices[0].message.content)
         
         except Exception as e:
             print(f"Error parsing datetime: {e}")
             return None
     
+    def iter_format_events(self, events: Iterable[Dict]) -> Iterator[str]:
+        """
+        Format events lazily, yielding the header and then one block per event
+        
+        Args:
+            events: Any iterable of event dictionaries, including generators
+        
+        Returns:
+            Iterator of formatted string chunks
+        """
+        iterator = iter(events)
+        first = next(iterator, None)
+        if first is None:
+            yield "No events found."
+            return
+        
+        # Generators don't know their length up front, so only sized inputs get a count
+        if isinstance(events, Sized):
+            yield f"📅 Found {len(events)} event(s):\n\n"
+        else:
+            yield "📅 Found event(s):\n\n"
+        
+        for i, event in enumerate(itertools.chain((first,), iterator), 1):
+            get = event.get
+            fields = (
+                get('summary', 'No Title'), get('start', 'Unknown time'),
+                get('description'), get('location'), get('link'),
+            )
+            try:
+                block = _format_event_block(*fields)
+            except TypeError:
+                # Unhashable field values can't be cached; format them directly
+                block = _format_event_block.__wrapped__(*fields)
+            yield f"{i}. {block}"
+    
     def format_events_for_display(self, events: List[Dict]) -> str:
         """
         Format events list into a readable message
@@ -191,36 +610,41 @@ Examples:
         Returns:
             Formatted string for display
         """
-        if not events:
-            return "No events found."
-        
-        formatted = f"📅 Found {len(events)} event(s):\n\n"
-        
-        for i, event in enumerate(events, 1):
-            start = event.get('start', 'Unknown time')
-            try:
-                # Try to format the datetime nicely
-                if 'T' in start:
-                    dt = datetime.datetime.fromisoformat(start.replace('Z', '+00:00'))
-                    start = dt.strftime('%B %d, %Y at %I:%M %p')
-            except:
-                pass
-            
-            formatted += f"{i}. 📌 {event.get('summary', 'No Title')}\n"
-            formatted += f"   ⏰ {start}\n"
-            
-            if event.get('description'):
-                formatted += f"   📝 {event['description']}\n"
-            
-            if event.get('location'):
-                formatted += f"   📍 {event['location']}\n"
-            
-            if event.get('link'):
-                formatted += f"   🔗 {event['link']}\n"
-            
-            formatted += "\n"
+        return "".join(self.iter_format_events(events))
+    
+    def _compact_start(self, start) -> str:
+        """Shorten an ISO start time to a compact token for LLM prompts"""
+        if not start or 'T' not in start:
+            return start or ''
+        try:
+            dt = datetime.datetime.fromisoformat(start.replace('Z', '+00:00'))
+        except ValueError:
+            return start
+        return dt.strftime('%a %b %d %H:%M')
+    
+    def _summary_kwargs(self, events: Iterable[Dict]) -> Dict:
+        """Build the chat completion arguments for an events summary"""
+        # Compact "Title Mon Jan 06 14:00" entries on one line keep the prompt short
+        events_text = " | ".join([
+            f"{(event.get('summary') or '')[:60]} {self._compact_start(event.get('start'))}"
+            for event in itertools.islice(events, 10)  # Limit to 10 events
+        ])
         
-        return formatted
+        return {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that summarizes calendar events in a friendly, concise way."
+                },
+                {
+                    "role": "user",
+                    "content": f"Summarize these upcoming events:\n• {events_text}"
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 200
+        }
     
     def create_smart_summary(self, events: List[Dict]) -> str:
         """
@@ -235,30 +659,54 @@ Examples:
         if not events:
             return "You have no upcoming events. Your schedule is clear! ✨"
         
-        events_text = "\n".join([
-            f"- {event.get('summary')} at {event.get('start')}" 
-            for event in events[:10]  # Limit to 10 events
-        ])
+        try:
+            response = self.client.chat.completions.create(**self._summary_kwargs(events))
+            return response.choices[0].message.content.strip()
+        
+        except Exception as e:
+            print(f"Error creating summary: {e}")
+            return self.format_events_for_display(events)
+    
+    async def acreate_smart_summary(self, events: List[Dict]) -> str:
+        """
+        Async version of create_smart_summary
+        
+        Args:
+            events: List of event dictionaries
+        
+        Returns:
+            Smart summary of the events
+        """
+        if not events:
+            return "You have no upcoming events. Your schedule is clear! ✨"
         
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that summarizes calendar events in a friendly, concise way."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Summarize these upcoming events:\n{events_text}"
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
-            
+            response = await self.aclient.chat.completions.create(**self._summary_kwargs(events))
             return response.choices[0].message.content.strip()
         
         except Exception as e:
             print(f"Error creating summary: {e}")
             return self.format_events_for_display(events)
+    
+    async def acreate_smart_summary_stream(self, events: List[Dict]) -> AsyncIterator[str]:
+        """
+        Stream an AI-generated summary of events as it is generated
+        
+        Args:
+            events: List of event dictionaries
+        
+        Yields:
+            Chunks of the summary
+        """
+        if not events:
+            yield "You have no upcoming events. Your schedule is clear! ✨"
+            return
+        
+        try:
+            stream = await self.aclient.chat.completions.create(**self._summary_kwargs(events), stream=True)
+            async for chunk in stream:
+                yield chunk.choices[0].delta.content or ""
+        
+        except Exception as e:
+            print(f"Error streaming summary: {e}")
+            yield self.format_events_for_display(events)
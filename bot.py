@@ -2,19 +2,26 @@
 Telegram Bot Module
 Handles all Telegram interactions and integrates AI Agent with Calendar Manager
 """
+import asyncio
+import re
+import weakref
+import functools
 import logging
 import datetime
 import calendar as cal_module
-from telegram import Update, KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove
+from typing import Optional
+from telegram import Update, CallbackQuery, KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application,
     CommandHandler,
     MessageHandler,
+    CallbackQueryHandler,
     filters,
     ContextTypes
 )
 from ai_agent import AIAgent
 from calendar_manager import CalendarManager
+from calendar_cache import CalendarCache
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_USER_ID, BOT_NAME
 
 # Enable logging
@@ -24,50 +31,461 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds a cached calendar read is reused before Cal.com is queried again
+CALENDAR_CACHE_TTL = 30
+
+# Main menu reply keyboard button texts
+_BUTTON_TEXTS = frozenset({"➕ Add Event", "📅 Upcoming", "📋 Today", "🔍 Search", "✏️ Edit Event", "🗑️ Delete Event"})
+
+# Reply sent when a calendar feature is used without a working Cal.com connection
+_DISABLED_MSG = "❌ Calendar features are disabled. Please add CALCOM_API_KEY to your .env file and restart the bot."
+
+# Static reply fragments shared by the event list handlers
+UPCOMING_EVENTS_HEADER = "📅 Your Upcoming Events:\n\n"
+EVENT_TIME_FORMAT = '%B %d, %Y at %I:%M %p'
+BUTTON_TIME_FORMAT = '%b %d, %I:%M %p'
+
+# Month names resolved once at import, so reply formatting skips a strftime call per message
+_MONTHS = tuple(cal_module.month_name[1:])
+
+
+def format_event_date(d: datetime.date) -> str:
+    """Format a date like strftime('%B %d, %Y')"""
+    return f"{_MONTHS[d.month - 1]} {d.day:02d}, {d.year}"
+
+
+def format_event_time(dt: datetime.datetime) -> str:
+    """Format a datetime like strftime(EVENT_TIME_FORMAT)"""
+    return (
+        f"{_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year} at "
+        f"{(dt.hour - 1) % 12 + 1:02d}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+    )
+
+# Strict ISO 8601 date or datetime, as produced by the AI analysis for exact times
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?$')
+
+# Messages whose intent is unambiguous, answered without calling the LLM.
+# Keys are lowercased with surrounding whitespace and trailing punctuation removed.
+_GREETING_REPLY = "👋 Hi! How can I help with your calendar today?"
+DIRECT_INTENTS = {
+    "today": ('get_date_events', {'date': 'today'}),
+    "what's on my calendar today": ('get_date_events', {'date': 'today'}),
+    "tomorrow": ('get_date_events', {'date': 'tomorrow'}),
+    "upcoming": ('list_events', {}),
+    "show my events": ('list_events', {}),
+    "show my upcoming events": ('list_events', {}),
+    "hi": ('general_chat', {'response_text': _GREETING_REPLY}),
+    "hello": ('general_chat', {'response_text': _GREETING_REPLY}),
+    "hey": ('general_chat', {'response_text': _GREETING_REPLY}),
+}
+
+
+# user_data keys owned by the create/search/edit flows, dropped when a flow ends
+_FLOW_KEYS = (
+    'creating_event', 'event_data', 'waiting_for_search', 'waiting_for_title',
+    'waiting_for_new_title', 'editing_event_id', 'editing_mode',
+)
+
+
+def reset_flow(user_data: dict):
+    """Remove the flow state from user_data, leaving any other keys in place"""
+    for key in _FLOW_KEYS:
+        user_data.pop(key, None)
+
+
+# Compact callback_data tags for the date/time pickers; the value follows as hex
+CB_DAY = "cd"
+CB_HOUR = "hr"
+CB_MINUTE = "mi"
+
+# Month layouts are pure functions of (year, month), so every consumer shares one cache
+_monthcalendar = functools.lru_cache(maxsize=128)(cal_module.monthcalendar)
+
+
+@functools.lru_cache(maxsize=64)
+def build_calendar_keyboard(year: int, month: int) -> InlineKeyboardMarkup:
+    """Build the inline date picker for a month; the markup is shared between users"""
+    button = InlineKeyboardButton  # local alias for the per-day loop
+    keyboard = []
+    
+    # Month and year header
+    month_name = cal_module.month_name[month]
+    keyboard.append([
+        InlineKeyboardButton("◀️", callback_data=f"cal_prev_{year}_{month}"),
+        InlineKeyboardButton(f"{month_name} {year}", callback_data="cal_ignore"),
+        InlineKeyboardButton("▶️", callback_data=f"cal_next_{year}_{month}")
+    ])
+    
+    # Day names
+    keyboard.append([
+        InlineKeyboardButton(day, callback_data="cal_ignore") 
+        for day in ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
+    ])
+    
+    # Calendar days
+    month_calendar = _monthcalendar(year, month)
+    for week in month_calendar:
+        row = []
+        for day in week:
+            if day == 0:
+                row.append(button(" ", callback_data="cal_ignore"))
+            else:
+                row.append(button(
+                    str(day), 
+                    callback_data=f"{CB_DAY}{(year << 16) | (month << 8) | day:06x}"
+                ))
+        keyboard.append(row)
+    
+    # Cancel button
+    keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+@functools.lru_cache(maxsize=256)
+def format_button_time(start: str) -> str:
+    """Format an event start time for a button label; the same starts repeat across views"""
+    if 'T' not in start:
+        return start
+    # Malformed starts are shown as-is rather than failing the whole keyboard
+    dt = parse_iso_fast(start)
+    return dt.strftime(BUTTON_TIME_FORMAT) if dt else start
+
+
+def parse_iso_fast(value: str) -> Optional[datetime.datetime]:
+    """Parse a strict ISO 8601 date/datetime, or return None so callers can fall back to the AI parser"""
+    if not _ISO_RE.match(value):
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except ValueError:
+        return None
+
+
+def build_prefix_trie(routes: dict) -> dict:
+    """
+    Build a character trie for longest-prefix matching
+    
+    Args:
+        routes: Mapping of prefix -> value
+    
+    Returns:
+        Nested dicts keyed by character; a node's None key holds (prefix length, value)
+    """
+    trie = {}
+    for prefix, value in routes.items():
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[None] = (len(prefix), value)
+    return trie
+
+
+def match_prefix(trie: dict, data: str) -> Optional[tuple]:
+    """Return (prefix length, value) for the longest prefix of data in the trie, or None"""
+    node = trie
+    best = None
+    for char in data:
+        node = node.get(char)
+        if node is None:
+            break
+        best = node.get(None, best)
+    return best
+
+
+# Time pickers, built once at import. The hour picker has morning, afternoon and
+# evening rows; the minute picker (15-minute intervals) is prebuilt for every hour.
+_PICKER_CANCEL_ROW = [InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")]
+_KB_HOUR_PICKER = InlineKeyboardMarkup([
+    *(
+        [InlineKeyboardButton(f"{h}:00", callback_data=f"{CB_HOUR}{h:x}") for h in range(start, start + 6)]
+        for start in (6, 12, 18)
+    ),
+    _PICKER_CANCEL_ROW
+])
+_KB_MINUTE_PICKER = {
+    hour: InlineKeyboardMarkup([
+        [InlineKeyboardButton(f"{hour}:{m:02d}", callback_data=f"{CB_MINUTE}{m:x}") for m in (0, 15, 30, 45)],
+        _PICKER_CANCEL_ROW
+    ])
+    for hour in range(24)
+}
+
+
+# Inline keyboards for the event list replies, shared by every request.
+# The /today and /upcoming commands label the last button "Main Menu".
+_KB_COMMAND_EMPTY_TODAY = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
+    [InlineKeyboardButton("📅 Upcoming", callback_data="menu_upcoming")],
+    [InlineKeyboardButton("🔙 Main Menu", callback_data="menu_back")]
+])
+_KB_COMMAND_EMPTY_UPCOMING = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
+    [InlineKeyboardButton("🔙 Main Menu", callback_data="menu_back")]
+])
+_KB_COMMAND_EVENTS = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
+    [InlineKeyboardButton("✏️ Edit", callback_data="menu_edit"), InlineKeyboardButton("🗑️ Delete", callback_data="menu_delete")],
+    [InlineKeyboardButton("🔙 Main Menu", callback_data="menu_back")]
+])
+_KB_EMPTY_TODAY = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
+    [InlineKeyboardButton("📅 Upcoming", callback_data="menu_upcoming")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+_KB_EMPTY_UPCOMING = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+_KB_EVENTS_ACTIONS = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
+    [InlineKeyboardButton("🗑️ Delete Event", callback_data="menu_delete")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+
+# Inline keyboards for the create, delete, edit and search flows
+_KB_CANCEL_TO_MENU = InlineKeyboardMarkup([[InlineKeyboardButton("❌ Cancel", callback_data="menu_back")]])
+_KB_POST_CREATE = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add Another", callback_data="menu_add")],
+    [InlineKeyboardButton("📅 View Upcoming", callback_data="menu_upcoming")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+_KB_POST_DELETE_OK = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📅 View Upcoming", callback_data="menu_upcoming")],
+    [InlineKeyboardButton("🗑️ Delete Another", callback_data="menu_delete")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+_KB_POST_DELETE_FAIL = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Try Again", callback_data="menu_delete")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+# Delete confirmation outcome (text template, keyboard), indexed by success
+_DELETE_REPLIES = {
+    True: ("✅ Event deleted successfully!", _KB_POST_DELETE_OK),
+    False: ("❌ Failed to delete event: {error}", _KB_POST_DELETE_FAIL),
+}
+_KB_SEARCH_FOUND = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔍 Search Again", callback_data="menu_search")],
+    [InlineKeyboardButton("📅 View All", callback_data="menu_upcoming")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+_KB_SEARCH_NONE = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔍 Search Again", callback_data="menu_search")],
+    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+_KB_POST_EDIT_OK = InlineKeyboardMarkup([
+    [InlineKeyboardButton("✏️ Edit Another", callback_data="menu_edit")],
+    [InlineKeyboardButton("📅 View Upcoming", callback_data="menu_upcoming")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+_KB_POST_EDIT_FAIL = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Try Again", callback_data="menu_edit")],
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+])
+
+
+def build_delete_confirm_keyboard(event_id: str) -> InlineKeyboardMarkup:
+    """Build the yes/cancel keyboard confirming deletion of an event"""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("✅ Yes, Delete", callback_data=f"confirm_delete_{event_id}"),
+            InlineKeyboardButton("❌ Cancel", callback_data="menu_back")
+        ]
+    ])
+
+
+def build_edit_choice_keyboard(event_id: str) -> InlineKeyboardMarkup:
+    """Build the keyboard choosing what to edit on an event"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("📝 Change Title", callback_data=f"edit_title_{event_id}")],
+        [InlineKeyboardButton("⏰ Change Time", callback_data=f"edit_time_{event_id}")],
+        [InlineKeyboardButton("🔙 Back", callback_data="menu_edit")]
+    ])
+
+
+def requires_calendar(handler):
+    """Reply with the disabled notice instead of running an update handler when Cal.com is not connected"""
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        if not self.calendar_enabled:
+            return await self._reply_disabled(update)
+        return await handler(self, update, context, *args, **kwargs)
+    return wrapper
+
+
+def requires_calendar_query(handler):
+    """Edit the callback message to the disabled notice instead of running handler when Cal.com is not connected"""
+    @functools.wraps(handler)
+    async def wrapper(self, query, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        if not self.calendar_enabled:
+            await query.edit_message_text(_DISABLED_MSG)
+            return
+        return await handler(self, query, context, *args, **kwargs)
+    return wrapper
+
+
 
 class TelegramBot:
     """Telegram bot handler with AI integration"""
     
+    BACK_TO_MENU_ROW = [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
+    BACK_TO_MENU_KEYBOARD = InlineKeyboardMarkup([BACK_TO_MENU_ROW])
+    
     def __init__(self):
-        self.ai_agent = AIAgent()
-        self.calendar_manager = CalendarManager()
-        self.calendar_enabled = self.calendar_manager.is_connected()
-        self.app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        # The AI agent is created on first use; Cal.com is probed in post_init, off the event loop
+        self._calendar_enabled_cache = None
+        self._calendar_cache = CalendarCache(CALENDAR_CACHE_TTL)
+        # Per-chat locks, dropped once no handler of that chat holds them
+        self._chat_locks = weakref.WeakValueDictionary()
+        self._build_static_replies()
+        self._build_callback_routes()
+        
+        # Main menu buttons that run a handler, and those that wait for typed input
+        self._button_actions = {
+            "➕ Add Event": self.create_event_command,
+            "📅 Upcoming": self.upcoming_command,
+            "📋 Today": self.today_command,
+            "🗑️ Delete Event": self.show_delete_options
+        }
+        self._button_states = {
+            "🔍 Search": ('waiting_for_search', "🔍 Please enter your search query:"),
+            "✏️ Edit Event": ('waiting_for_edit_query', "✏️ Please type the name of the event you want to edit:")
+        }
+        
+        # Updates from different chats are handled concurrently; every handler is
+        # registered through _in_chat_order, so one chat's updates (and the flow
+        # state they share in context.user_data) are still handled one at a time
+        self.app = (
+            Application.builder()
+            .token(TELEGRAM_BOT_TOKEN)
+            .concurrent_updates(256)
+            .http_version("1.1")
+            .get_updates_http_version("1.1")
+            .read_timeout(20)
+            .write_timeout(20)
+            .pool_timeout(10)
+            .post_init(self._post_init)
+            .build()
+        )
         self.setup_handlers()
-        
-        if not self.calendar_enabled:
-            print("\n⚠️  Bot started in LIMITED MODE - Calendar features disabled")
-            print("📝 The bot will work but cannot manage calendar bookings")
-            print("✅ To enable full features, add CALCOM_API_KEY to .env and restart\n")
+    
+    @functools.cached_property
+    def ai_agent(self) -> AIAgent:
+        """AI agent, created on first use"""
+        return AIAgent()
+    
+    @functools.cached_property
+    def calendar_manager(self) -> CalendarManager:
+        """Cal.com manager, created (and authenticated) on first use"""
+        return CalendarManager()
+    
+    def _probe_calendar(self) -> bool:
+        """Create the Cal.com manager (a blocking authentication request) and log the resulting mode"""
+        enabled = self.calendar_manager.is_connected()
+        if not enabled:
+            logger.warning(
+                "Bot running in LIMITED MODE - Calendar features disabled. "
+                "The bot will work but cannot manage calendar bookings; "
+                "add CALCOM_API_KEY to .env and restart to enable full features"
+            )
         else:
-            print("\n✅ Bot started successfully with full Cal.com calendar features\n")
+            logger.info("Cal.com connected - full calendar features enabled")
+        return enabled
+    
+    async def _post_init(self, application: Application):
+        """Probe Cal.com at startup in a worker thread, before any update is handled"""
+        self._calendar_enabled_cache = await self._run(self._probe_calendar)
+    
+    @property
+    def calendar_enabled(self) -> bool:
+        """Whether calendar features are available; set by the startup probe in _post_init"""
+        if self._calendar_enabled_cache is None:
+            self._calendar_enabled_cache = self._probe_calendar()
+        return self._calendar_enabled_cache
+    
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking call (Cal.com HTTP request) in a worker thread so the event loop stays free"""
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    async def _get_upcoming_events(self, max_results: int = 10) -> list:
+        """Get upcoming events through the calendar cache"""
+        return await self._calendar_cache.call(
+            ('upcoming', max_results),
+            self.calendar_manager.get_upcoming_events, max_results=max_results
+        )
+    
+    async def _get_events_for_date(self, date: datetime.date) -> list:
+        """Get the events on a date through the calendar cache"""
+        return await self._calendar_cache.call(
+            ('date', date),
+            self.calendar_manager.get_events_for_date, date
+        )
+    
+    async def _search_events(self, query: str) -> list:
+        """Search events through the calendar cache; Cal.com matching is case-insensitive"""
+        return await self._calendar_cache.call(
+            ('search', query.strip().lower()),
+            self.calendar_manager.search_events, query
+        )
+    
+    def _invalidate_calendar_cache(self):
+        """Drop cached calendar reads after a booking is created, changed or deleted"""
+        self._calendar_cache.clear()
+    
+    def _chat_lock(self, chat_id: int) -> asyncio.Lock:
+        """Get the lock serializing update handling within one chat"""
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_locks[chat_id] = asyncio.Lock()
+        return lock
+    
+    def _in_chat_order(self, handler):
+        """
+        Wrap an update handler so it runs under its chat's lock
+        
+        Only the registered entry points are wrapped; handlers they call directly
+        (e.g. handle_button -> create_event_command) already hold the lock.
+        """
+        @functools.wraps(handler)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            async with self._chat_lock(update.effective_chat.id):
+                return await handler(update, context)
+        return wrapper
     
     def setup_handlers(self):
         """Set up command and message handlers"""
-        self.app.add_handler(CommandHandler("start", self.start_command))
-        self.app.add_handler(CommandHandler("help", self.help_command))
-        self.app.add_handler(CommandHandler("today", self.today_command))
-        self.app.add_handler(CommandHandler("upcoming", self.upcoming_command))
-        self.app.add_handler(CommandHandler("create", self.create_event_command))
-        self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
-    
-    def get_main_menu_keyboard(self):
-        """Generate main menu keyboard"""
-        keyboard = [
-            ["➕ Add Event", "📅 Upcoming"],
-            ["📋 Today", "🔍 Search"],
-            ["✏️ Edit Event", "🗑️ Delete Event"]
-        ]
-        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
+        ordered = self._in_chat_order
+        self.app.add_handler(CommandHandler("start", ordered(self.start_command)))
+        self.app.add_handler(CommandHandler("help", ordered(self.help_command)))
+        self.app.add_handler(CommandHandler("today", ordered(self.today_command)))
+        self.app.add_handler(CommandHandler("upcoming", ordered(self.upcoming_command)))
+        self.app.add_handler(CommandHandler("create", ordered(self.create_event_command)))
+        # Menu buttons are matched by a hashed exact-text lookup before the free-text handler
+        self.app.add_handler(MessageHandler(filters.Text(_BUTTON_TEXTS), ordered(self.handle_button)))
+        self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, ordered(self.handle_message)))
+        
+        # Argument-less callbacks are picked by PTB with a dict membership test;
+        # everything else falls through to the prefix router
+        self.app.add_handler(CallbackQueryHandler(
+            ordered(self.exact_callback), pattern=self._exact_callbacks.__contains__
+        ))
+        self.app.add_handler(CallbackQueryHandler(ordered(self.prefix_callback)))
     
-    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /start command"""
-        user_id = update.effective_user.id
-        
-        calendar_status = "" if self.calendar_enabled else "\n⚠️ Calendar features currently disabled. Please add CALCOM_API_KEY to .env to enable.\n"
+    def _build_static_replies(self):
+        """Build the keyboard and fixed reply texts once instead of on every message"""
+        self._main_menu_keyboard = ReplyKeyboardMarkup(
+            [
+                ["➕ Add Event", "📅 Upcoming"],
+                ["📋 Today", "🔍 Search"],
+                ["✏️ Edit Event", "🗑️ Delete Event"]
+            ],
+            resize_keyboard=True,
+            one_time_keyboard=False
+        )
         
-        welcome_message = f"""
-🤖 Welcome to {BOT_NAME}!{calendar_status}
+        welcome_template = """
+🤖 Welcome to {bot_name}!{calendar_status}
 
 I'm your intelligent calendar and task management assistant. 
 
@@ -78,16 +496,15 @@ Examples:
 • "What's on my calendar today?"
 • "Show my upcoming events"
 """
+        self._welcome_messages = {
+            True: welcome_template.format(bot_name=BOT_NAME, calendar_status=""),
+            False: welcome_template.format(
+                bot_name=BOT_NAME,
+                calendar_status="\n⚠️ Calendar features currently disabled. Please add CALCOM_API_KEY to .env to enable.\n"
+            )
+        }
         
-        await update.message.reply_text(
-            welcome_message,
-            reply_markup=self.get_main_menu_keyboard()
-        )
-        logger.info(f"User {user_id} started the bot")
-    
-    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /help command"""
-        help_message = """
+        self._help_message = """
 📖 How to use me:
 
 🗣️ Natural Language:
@@ -107,34 +524,47 @@ Examples:
 
 💡 Or use the menu buttons below! 👇
 """
-        keyboard = self.get_main_menu_keyboard()
-        await update.message.reply_text(help_message, reply_markup=keyboard)
+        
+        # Complete reply_text arguments for the static replies, reused as-is on every send
+        self._welcome_send_kwargs = {
+            enabled: {"text": text, "reply_markup": self._main_menu_keyboard}
+            for enabled, text in self._welcome_messages.items()
+        }
+        self._help_send_kwargs = {"text": self._help_message, "reply_markup": self._main_menu_keyboard}
+        self._disabled_send_kwargs = {"text": _DISABLED_MSG, "reply_markup": self._main_menu_keyboard}
     
+    async def _reply_disabled(self, update: Update):
+        """Tell the user that calendar features are unavailable"""
+        await update.message.reply_text(**self._disabled_send_kwargs)
+    
+    def get_main_menu_keyboard(self):
+        """Get the main menu keyboard"""
+        return self._main_menu_keyboard
+    
+    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /start command"""
+        user_id = update.effective_user.id
+        
+        await update.message.reply_text(**self._welcome_send_kwargs[self.calendar_enabled])
+        logger.info(f"User {user_id} started the bot")
+    
+    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /help command"""
+        await update.message.reply_text(**self._help_send_kwargs)
+    
+    @requires_calendar
     async def today_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /today command - show today's events"""
-        if not self.calendar_enabled:
-            await update.message.reply_text("❌ Calendar features are disabled. Please add CALCOM_API_KEY to your .env file and restart the bot.")
-            return
-        
         try:
             today = datetime.date.today()
-            events = self.calendar_manager.get_events_for_date(today)
+            events = await self._get_events_for_date(today)
             
             if not events:
                 response = "📅 You have no events scheduled for today. Enjoy your free time! ✨"
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("📅 Upcoming", callback_data="menu_upcoming")],
-                    [InlineKeyboardButton("🔙 Main Menu", callback_data="menu_back")]
-                ])
+                keyboard = _KB_COMMAND_EMPTY_TODAY
             else:
-                response = f"📅 Today's Schedule ({today.strftime('%B %d, %Y')}):\n\n"
-                response += self.ai_agent.format_events_for_display(events)
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("✏️ Edit", callback_data="menu_edit"), InlineKeyboardButton("🗑️ Delete", callback_data="menu_delete")],
-                    [InlineKeyboardButton("🔙 Main Menu", callback_data="menu_back")]
-                ])
+                response = f"📅 Today's Schedule ({format_event_date(today)}):\n\n{self.ai_agent.format_events_for_display(events)}"
+                keyboard = _KB_COMMAND_EVENTS
             
             await update.message.reply_text(response, reply_markup=keyboard)
         
@@ -142,29 +572,18 @@ Examples:
             logger.error(f"Error in today_command: {e}")
             await update.message.reply_text("Sorry, I encountered an error retrieving today's events. Please try again.")
     
+    @requires_calendar
     async def upcoming_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /upcoming command - show upcoming events"""
-        if not self.calendar_enabled:
-            await update.message.reply_text("❌ Calendar features are disabled. Please add CALCOM_API_KEY to your .env file and restart the bot.")
-            return
-        
         try:
-            events = self.calendar_manager.get_upcoming_events(max_results=10)
+            events = await self._get_upcoming_events(max_results=10)
             
             if not events:
                 response = "📅 You have no upcoming events. Your schedule is clear! ✨"
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("🔙 Main Menu", callback_data="menu_back")]
-                ])
+                keyboard = _KB_COMMAND_EMPTY_UPCOMING
             else:
-                response = "📅 Your Upcoming Events:\n\n"
-                response += self.ai_agent.format_events_for_display(events)
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("✏️ Edit", callback_data="menu_edit"), InlineKeyboardButton("🗑️ Delete", callback_data="menu_delete")],
-                    [InlineKeyboardButton("🔙 Main Menu", callback_data="menu_back")]
-                ])
+                response = UPCOMING_EVENTS_HEADER + self.ai_agent.format_events_for_display(events)
+                keyboard = _KB_COMMAND_EVENTS
             
             await update.message.reply_text(response, reply_markup=keyboard)
         
@@ -172,6 +591,19 @@ Examples:
             logger.error(f"Error in upcoming_command: {e}")
             await update.message.reply_text("Sorry, I encountered an error retrieving upcoming events. Please try again.")
     
+    async def handle_button(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle main menu keyboard buttons"""
+        user_message = update.message.text
+        
+        handler = self._button_actions.get(user_message)
+        if handler:
+            await handler(update, context)
+            return
+        
+        flag, prompt = self._button_states[user_message]
+        context.user_data[flag] = True
+        await update.message.reply_text(prompt, reply_markup=self._main_menu_keyboard)
+    
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle text messages with AI processing"""
         user_message = update.message.text
@@ -179,29 +611,6 @@ Examples:
         
         logger.info(f"Received message from {user_id}: {user_message}")
         
-        # Check if message is from keyboard button
-        if user_message in ["➕ Add Event", "📅 Upcoming", "📋 Today", "🔍 Search", "✏️ Edit Event", "🗑️ Delete Event"]:
-            if user_message == "➕ Add Event":
-                await self.create_event_command(update, context)
-                return
-            elif user_message == "📅 Upcoming":
-                await self.upcoming_command(update, context)
-                return
-            elif user_message == "📋 Today":
-                await self.today_command(update, context)
-                return
-            elif user_message == "🔍 Search":
-                context.user_data['waiting_for_search'] = True
-                await update.message.reply_text("🔍 Please enter your search query:", reply_markup=self.get_main_menu_keyboard())
-                return
-            elif user_message == "✏️ Edit Event":
-                await update.message.reply_text("✏️ Please type the name of the event you want to edit:", reply_markup=self.get_main_menu_keyboard())
-                context.user_data['waiting_for_edit_query'] = True
-                return
-            elif user_message == "🗑️ Delete Event":
-                await self.show_delete_options(update, context)
-                return
-        
         # Check if we're waiting for event title
         if context.user_data.get('waiting_for_title'):
             await self.process_event_creation(update, context, user_message)
@@ -217,12 +626,15 @@ Examples:
             await self.process_title_edit(update, context, user_message)
             return
         
-        # Send typing indicator
-        await update.message.chat.send_action(action="typing")
-        
         try:
-            # Analyze the user's request with AI
-            analysis = self.ai_agent.analyze_user_request(user_message)
+            # Skip the LLM for obvious intents, otherwise analyze the request with AI
+            # while the typing indicator is being sent
+            analysis = self._direct_intent(user_message)
+            if analysis is None:
+                analysis, _ = await asyncio.gather(
+                    self.ai_agent.aanalyze_user_request(user_message),
+                    update.message.chat.send_action(action="typing")
+                )
             action = analysis.get('action', 'general_chat')
             params = analysis.get('parameters', {})
             
@@ -232,8 +644,7 @@ Examples:
             if action == 'create_event':
                 # Show calendar picker instead of trying to parse dates
                 if not self.calendar_enabled:
-                    await update.message.reply_text("❌ Calendar features are disabled. Please add CALCOM_API_KEY to your .env file and restart the bot.")
-                    return
+                    return await self._reply_disabled(update)
                 
                 # Store event title if provided
                 title = params.get('title', '')
@@ -247,10 +658,9 @@ Examples:
                 return
             
             elif action == 'list_events':
-                events = self.calendar_manager.get_upcoming_events(max_results=10)
+                events = await self._get_upcoming_events(max_results=10)
                 if events:
-                    response = "📅 Your Upcoming Events:\n\n"
-                    response += self.ai_agent.format_events_for_display(events)
+                    response = UPCOMING_EVENTS_HEADER + self.ai_agent.format_events_for_display(events)
                 else:
                     response = "You have no upcoming events. Your schedule is clear! ✨"
             
@@ -260,10 +670,9 @@ Examples:
             elif action == 'search_events':
                 query = params.get('query', '')
                 if query:
-                    events = self.calendar_manager.search_events(query)
+                    events = await self._search_events(query)
                     if events:
-                        response = f"🔍 Found events matching '{query}':\n\n"
-                        response += self.ai_agent.format_events_for_display(events)
+                        response = f"🔍 Found events matching '{query}':\n\n{self.ai_agent.format_events_for_display(events)}"
                     else:
                         response = f"No events found matching '{query}'."
                 else:
@@ -278,10 +687,10 @@ Examples:
             elif action == 'general_chat':
                 response = params.get('response_text', '')
                 if not response:
-                    response = self.ai_agent.generate_response(user_message)
+                    response = await self.ai_agent.agenerate_response(user_message)
             
             else:
-                response = self.ai_agent.generate_response(user_message)
+                response = await self.ai_agent.agenerate_response(user_message)
             
             await update.message.reply_text(response)
         
@@ -291,6 +700,14 @@ Examples:
                 "I apologize, but I encountered an error processing your request. Could you please try again or rephrase your request?"
             )
     
+    def _direct_intent(self, user_message: str):
+        """Return a ready-made analysis for messages in DIRECT_INTENTS, or None"""
+        intent = DIRECT_INTENTS.get(user_message.strip().lower().rstrip('?!.'))
+        if intent is None:
+            return None
+        action, params = intent
+        return {'action': action, 'parameters': dict(params)}
+    
     async def handle_create_event(self, params: dict, original_message: str) -> str:
         """Handle event creation"""
         if not self.calendar_enabled:
@@ -306,10 +723,8 @@ Examples:
             
             # Try to parse datetime
             if start_time_str:
-                try:
-                    start_time = datetime.datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                except:
-                    start_time = self.ai_agent.parse_datetime(start_time_str)
+                # Only fuzzy descriptions go to the AI parser
+                start_time = parse_iso_fast(start_time_str) or await self.ai_agent.aparse_datetime(start_time_str)
             else:
                 return "I need to know when you want to schedule this event. Please specify a date and time."
             
@@ -318,15 +733,13 @@ Examples:
             
             # Calculate end time
             if end_time_str:
-                try:
-                    end_time = datetime.datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
-                except:
-                    end_time = self.ai_agent.parse_datetime(end_time_str)
+                end_time = parse_iso_fast(end_time_str) or await self.ai_agent.aparse_datetime(end_time_str)
             else:
                 end_time = start_time + datetime.timedelta(minutes=duration_minutes)
             
             # Create the event
-            result = self.calendar_manager.create_event(
+            result = await self._run(
+                self.calendar_manager.create_event,
                 summary=title,
                 start_time=start_time,
                 end_time=end_time,
@@ -335,12 +748,14 @@ Examples:
             )
             
             if result.get('success'):
-                response = f"✅ Event created successfully!\n\n"
-                response += f"📌 {result['summary']}\n"
-                response += f"⏰ {start_time.strftime('%B %d, %Y at %I:%M %p')}\n"
-                if result.get('link'):
-                    response += f"🔗 {result['link']}"
-                return response
+                self._invalidate_calendar_cache()
+                link = f"🔗 {result['link']}" if result.get('link') else ""
+                return (
+                    f"✅ Event created successfully!\n\n"
+                    f"📌 {result['summary']}\n"
+                    f"⏰ {format_event_time(start_time)}\n"
+                    f"{link}"
+                )
             else:
                 return f"❌ Failed to create event: {result.get('error', 'Unknown error')}"
         
@@ -359,17 +774,19 @@ Examples:
                 elif date_str.lower() == 'tomorrow':
                     target_date = datetime.date.today() + datetime.timedelta(days=1)
                 else:
-                    target_date = datetime.datetime.fromisoformat(date_str).date()
+                    parsed = parse_iso_fast(date_str) or await self.ai_agent.aparse_datetime(date_str)
+                    if not parsed:
+                        return "I couldn't understand the date you specified. Please try again with a clearer date."
+                    target_date = parsed.date()
             else:
                 target_date = datetime.date.today()
             
-            events = self.calendar_manager.get_events_for_date(target_date)
+            events = await self._get_events_for_date(target_date)
             
             if not events:
-                return f"📅 No events scheduled for {target_date.strftime('%B %d, %Y')}."
+                return f"📅 No events scheduled for {format_event_date(target_date)}."
             else:
-                response = f"📅 Events for {target_date.strftime('%B %d, %Y')}:\n\n"
-                response += self.ai_agent.format_events_for_display(events)
+                response = f"📅 Events for {format_event_date(target_date)}:\n\n{self.ai_agent.format_events_for_display(events)}"
                 return response
         
         except Exception as e:
@@ -383,29 +800,15 @@ Examples:
             event_id = params.get('event_id')
             
             if event_id:
-                result = self.calendar_manager.delete_event(event_id)
+                result = await self._run(self.calendar_manager.delete_event, event_id)
                 if result.get('success'):
+                    self._invalidate_calendar_cache()
                     return "✅ Event deleted successfully!"
                 else:
                     return f"❌ Failed to delete event: {result.get('error')}"
             
             elif query:
-                # Search for the event first
-                events = self.calendar_manager.search_events(query)
-                if not events:
-                    return f"No events found matching '{query}'."
-                elif len(events) == 1:
-                    # Only one match, delete it
-                    result = self.calendar_manager.delete_event(events[0]['id'])
-                    if result.get('success'):
-                        return f"✅ Deleted: {events[0]['summary']}"
-                    else:
-                        return f"❌ Failed to delete event: {result.get('error')}"
-                else:
-                    # Multiple matches, show them
-                    response = f"Found {len(events)} events matching '{query}'. Please be more specific:\n\n"
-                    response += self.ai_agent.format_events_for_display(events)
-                    return response
+                return await self.handle_cancel(query)
             else:
                 return "Please specify which event you want to delete."
         
@@ -413,6 +816,37 @@ Examples:
             logger.error(f"Error deleting event: {e}")
             return "I encountered an error while deleting the event."
     
+    async def handle_cancel(self, query: str) -> str:
+        """
+        Find and delete the event matching a query
+        
+        Only a single match is deleted; several matches are listed so the user
+        can be more specific.
+        
+        Args:
+            query: What the user called the event (e.g., "dentist appointment")
+        
+        Returns:
+            Response message for the user
+        """
+        events = await self._search_events(query)
+        
+        if not events:
+            return f"No events found matching '{query}'."
+        
+        if len(events) == 1:
+            # Only one match, delete it
+            result = await self._run(self.calendar_manager.delete_event, events[0]['id'])
+            if result.get('success'):
+                self._invalidate_calendar_cache()
+                return f"✅ Deleted: {events[0]['summary']}"
+            else:
+                return f"❌ Failed to delete event: {result.get('error')}"
+        
+        # Multiple matches, show them
+        response = f"Found {len(events)} events matching '{query}'. Please be more specific:\n\n{self.ai_agent.format_events_for_display(events)}"
+        return response
+    
     async def handle_update_event(self, params: dict) -> str:
         """Handle event updates"""
         try:
@@ -423,19 +857,19 @@ Examples:
             if event_id:
                 event = event_id
             elif query:
-                events = self.calendar_manager.search_events(query)
+                events = await self._search_events(query)
                 if not events:
                     return f"No events found matching '{query}'."
                 elif len(events) > 1:
-                    response = f"Found {len(events)} events. Please be more specific:\n\n"
-                    response += self.ai_agent.format_events_for_display(events)
+                    response = f"Found {len(events)} events. Please be more specific:\n\n{self.ai_agent.format_events_for_display(events)}"
                     return response
                 event = events[0]['id']
             else:
                 return "Please specify which event you want to update."
             
             # Update the event
-            result = self.calendar_manager.update_event(
+            result = await self._run(
+                self.calendar_manager.update_event,
                 event_id=event,
                 summary=params.get('title'),
                 description=params.get('description'),
@@ -443,6 +877,7 @@ Examples:
             )
             
             if result.get('success'):
+                self._invalidate_calendar_cache()
                 return f"✅ Event updated successfully!\n🔗 {result.get('link', '')}"
             else:
                 return f"❌ Failed to update event: {result.get('error')}"
@@ -451,12 +886,9 @@ Examples:
             logger.error(f"Error updating event: {e}")
             return "I encountered an error while updating the event."
     
+    @requires_calendar
     async def create_event_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /create command - show date picker"""
-        if not self.calendar_enabled:
-            await update.message.reply_text("❌ Calendar features are disabled. Please add CALCOM_API_KEY to your .env file and restart the bot.")
-            return
-        
         # Store that we're in event creation mode
         context.user_data['creating_event'] = True
         context.user_data['event_data'] = {}
@@ -466,40 +898,7 @@ Examples:
     
     def generate_calendar_keyboard(self, year: int, month: int):
         """Generate inline keyboard with calendar"""
-        keyboard = []
-        
-        # Month and year header
-        month_name = cal_module.month_name[month]
-        keyboard.append([
-            InlineKeyboardButton("◀️", callback_data=f"cal_prev_{year}_{month}"),
-            InlineKeyboardButton(f"{month_name} {year}", callback_data="cal_ignore"),
-            InlineKeyboardButton("▶️", callback_data=f"cal_next_{year}_{month}")
-        ])
-        
-        # Day names
-        keyboard.append([
-            InlineKeyboardButton(day, callback_data="cal_ignore") 
-            for day in ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
-        ])
-        
-        # Calendar days
-        month_calendar = cal_module.monthcalendar(year, month)
-        for week in month_calendar:
-            row = []
-            for day in week:
-                if day == 0:
-                    row.append(InlineKeyboardButton(" ", callback_data="cal_ignore"))
-                else:
-                    row.append(InlineKeyboardButton(
-                        str(day), 
-                        callback_data=f"cal_day_{year}_{month}_{day}"
-                    ))
-            keyboard.append(row)
-        
-        # Cancel button
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
-        
-        return InlineKeyboardMarkup(keyboard)
+        return build_calendar_keyboard(year, month)
     
     async def show_calendar(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show calendar picker"""
@@ -519,93 +918,61 @@ Examples:
         keyboard = self.generate_calendar_keyboard(today.year, today.month)
         await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
     
+    @requires_calendar_query
     async def show_upcoming_events(self, query, context: ContextTypes.DEFAULT_TYPE):
         """Show upcoming events from callback"""
-        if not self.calendar_enabled:
-            await query.edit_message_text("❌ Calendar features are disabled.")
-            return
-        
         try:
-            events = self.calendar_manager.get_upcoming_events(max_results=10)
+            events = await self._get_upcoming_events(max_results=10)
             
             if not events:
                 response = "📅 You have no upcoming events. Your schedule is clear! ✨"
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                keyboard = _KB_EMPTY_UPCOMING
             else:
-                response = "📅 Your Upcoming Events:\n\n"
-                response += self.ai_agent.format_events_for_display(events)
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("🗑️ Delete Event", callback_data="menu_delete")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                response = UPCOMING_EVENTS_HEADER + self.ai_agent.format_events_for_display(events)
+                keyboard = _KB_EVENTS_ACTIONS
             
             await query.edit_message_text(response, reply_markup=keyboard)
         except Exception as e:
             logger.error(f"Error showing upcoming events: {e}")
             await query.edit_message_text("Sorry, I encountered an error. Please try again.")
     
+    @requires_calendar_query
     async def show_today_events(self, query, context: ContextTypes.DEFAULT_TYPE):
         """Show today's events from callback"""
-        if not self.calendar_enabled:
-            await query.edit_message_text("❌ Calendar features are disabled.")
-            return
-        
         try:
             today = datetime.date.today()
-            events = self.calendar_manager.get_events_for_date(today)
+            events = await self._get_events_for_date(today)
             
             if not events:
                 response = "📅 You have no events scheduled for today. Enjoy your free time! ✨"
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("📅 Upcoming", callback_data="menu_upcoming")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                keyboard = _KB_EMPTY_TODAY
             else:
-                response = f"📅 Today's Schedule ({today.strftime('%B %d, %Y')}):\n\n"
-                response += self.ai_agent.format_events_for_display(events)
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("🗑️ Delete Event", callback_data="menu_delete")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                response = f"📅 Today's Schedule ({format_event_date(today)}):\n\n{self.ai_agent.format_events_for_display(events)}"
+                keyboard = _KB_EVENTS_ACTIONS
             
             await query.edit_message_text(response, reply_markup=keyboard)
         except Exception as e:
             logger.error(f"Error showing today's events: {e}")
             await query.edit_message_text("Sorry, I encountered an error. Please try again.")
     
+    @requires_calendar_query
     async def show_events_for_edit(self, query, context: ContextTypes.DEFAULT_TYPE):
         """Show events list for editing"""
-        if not self.calendar_enabled:
-            await query.edit_message_text("❌ Calendar features are disabled.")
-            return
-        
         try:
-            events = self.calendar_manager.get_upcoming_events(max_results=10)
+            events = await self._get_upcoming_events(max_results=10)
             
             if not events:
-                keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]])
-                await query.edit_message_text("No upcoming events to edit.", reply_markup=keyboard)
+                await query.edit_message_text("No upcoming events to edit.", reply_markup=self.BACK_TO_MENU_KEYBOARD)
                 return
             
-            keyboard = []
-            for event in events[:10]:
-                event_time = event.get('start', '')
-                if 'T' in event_time:
-                    dt = datetime.datetime.fromisoformat(event_time.replace('Z', '+00:00'))
-                    time_str = dt.strftime('%b %d, %I:%M %p')
-                else:
-                    time_str = event_time
-                
-                button_text = f"{event.get('summary', 'Untitled')} - {time_str}"
-                keyboard.append([InlineKeyboardButton(button_text, callback_data=f"edit_{event['id']}")])
-            
-            keyboard.append([InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")])
+            keyboard = [
+                [InlineKeyboardButton(
+                    f"{event.get('summary', 'Untitled')} - {format_button_time(event.get('start', ''))}",
+                    callback_data=f"edit_{event['id']}"
+                )]
+                for event in events[:10]
+            ]
+            keyboard.append(self.BACK_TO_MENU_ROW)
             
             await query.edit_message_text(
                 "✏️ Select an event to edit:",
@@ -616,308 +983,299 @@ Examples:
             logger.error(f"Error showing events for edit: {e}")
             await query.edit_message_text("Sorry, I encountered an error. Please try again.")
     
-    async def show_events_for_delete(self, query, context: ContextTypes.DEFAULT_TYPE):
-        """Show events list for deletion"""
-        if not self.calendar_enabled:
-            await query.edit_message_text("❌ Calendar features are disabled.")
-            return
-        
+    def _build_delete_keyboard(self, events: list):
+        """Build the inline keyboard listing events to delete"""
+        keyboard = [
+            [InlineKeyboardButton(
+                f"🗑️ {event.get('summary', 'Untitled')} - {format_button_time(event.get('start', ''))}",
+                callback_data=f"delete_{event['id']}"
+            )]
+            for event in events[:10]
+        ]
+        keyboard.append(self.BACK_TO_MENU_ROW)
+        return InlineKeyboardMarkup(keyboard)
+    
+    @requires_calendar
+    async def show_delete_options(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle the Delete Event button - reply with the events that can be deleted"""
         try:
-            events = self.calendar_manager.get_upcoming_events(max_results=10)
+            events = await self._get_upcoming_events(max_results=10)
             
             if not events:
-                keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]])
-                await query.edit_message_text("No upcoming events to delete.", reply_markup=keyboard)
+                await update.message.reply_text("No upcoming events to delete.", reply_markup=self._main_menu_keyboard)
                 return
             
-            keyboard = []
-            for event in events[:10]:
-                event_time = event.get('start', '')
-                if 'T' in event_time:
-                    dt = datetime.datetime.fromisoformat(event_time.replace('Z', '+00:00'))
-                    time_str = dt.strftime('%b %d, %I:%M %p')
-                else:
-                    time_str = event_time
-                
-                button_text = f"🗑️ {event.get('summary', 'Untitled')} - {time_str}"
-                keyboard.append([InlineKeyboardButton(button_text, callback_data=f"delete_{event['id']}")])
+            await update.message.reply_text(
+                "🗑️ Select an event to delete:",
+                reply_markup=self._build_delete_keyboard(events)
+            )
+        except Exception as e:
+            logger.error(f"Error showing delete options: {e}")
+            await update.message.reply_text("Sorry, I encountered an error. Please try again.")
+    
+    @requires_calendar_query
+    async def show_events_for_delete(self, query, context: ContextTypes.DEFAULT_TYPE):
+        """Show events list for deletion"""
+        try:
+            events = await self._get_upcoming_events(max_results=10)
             
-            keyboard.append([InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")])
+            if not events:
+                await query.edit_message_text("No upcoming events to delete.", reply_markup=self.BACK_TO_MENU_KEYBOARD)
+                return
             
             await query.edit_message_text(
                 "🗑️ Select an event to delete:",
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=self._build_delete_keyboard(events)
             )
         except Exception as e:
             logger.error(f"Error showing events for delete: {e}")
             await query.edit_message_text("Sorry, I encountered an error. Please try again.")
     
-    async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle button callbacks"""
+    def _build_callback_routes(self):
+        """Build the callback_data routing tables used by the callback query handlers"""
+        # Callbacks without arguments, called as handler(query, context)
+        self._exact_callbacks = {
+            "menu_add": self._cb_menu_add,
+            "menu_upcoming": self.show_upcoming_events,
+            "menu_today": self.show_today_events,
+            "menu_search": self._cb_menu_search,
+            "menu_edit": self.show_events_for_edit,
+            "menu_delete": self.show_events_for_delete,
+            "menu_back": self._cb_menu_back,
+            "cal_ignore": self._cb_cal_ignore,
+            "cal_cancel": self._cb_cal_cancel,
+        }
+        # Callbacks carrying arguments after their prefix, called as handler(query, context, rest)
+        self._prefix_callbacks = build_prefix_trie({
+            "cal_prev_": self._cb_cal_prev,
+            "cal_next_": self._cb_cal_next,
+            CB_DAY: self._cb_cal_day,
+            CB_HOUR: self._cb_time,
+            CB_MINUTE: self._cb_minute,
+            "delete_": self._cb_delete,
+            "confirm_delete_": self._cb_confirm_delete,
+            "edit_": self._cb_edit,
+            "edit_title_": self._cb_edit_title,
+            "edit_time_": self._cb_edit_time,
+        })
+    
+    async def exact_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle callbacks whose callback_data is a key of the exact routing table"""
+        query = update.callback_query
+        await query.answer()
+        await self._exact_callbacks[query.data](query, context)
+    
+    async def prefix_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route the remaining callbacks by the longest matching callback_data prefix"""
         query = update.callback_query
         await query.answer()
         
         data = query.data
-        
-        # Handle main menu buttons
-        if data == "menu_add":
-            if not self.calendar_enabled:
-                await query.edit_message_text("❌ Calendar features are disabled. Please add CALCOM_API_KEY to your .env file and restart the bot.")
-                return
-            context.user_data['creating_event'] = True
-            context.user_data['event_data'] = {}
-            await self.show_calendar_in_callback(query, context)
+        match = match_prefix(self._prefix_callbacks, data)
+        if match:
+            prefix_len, handler = match
+            await handler(query, context, data[prefix_len:])
             return
         
-        if data == "menu_upcoming":
-            await self.show_upcoming_events(query, context)
-            return
+        logger.warning(f"Unhandled callback data: {data}")
+    
+    @requires_calendar_query
+    async def _cb_menu_add(self, query, context: ContextTypes.DEFAULT_TYPE):
+        """Start creating an event from the inline menu"""
+        context.user_data['creating_event'] = True
+        context.user_data['event_data'] = {}
+        await self.show_calendar_in_callback(query, context)
+    
+    async def _cb_menu_search(self, query, context: ContextTypes.DEFAULT_TYPE):
+        """Ask for a search query from the inline menu"""
+        await query.edit_message_text(
+            "🔍 Please type the event name or keyword you want to search for:",
+            reply_markup=_KB_CANCEL_TO_MENU
+        )
+        context.user_data['waiting_for_search'] = True
+    
+    async def _cb_menu_back(self, query, context: ContextTypes.DEFAULT_TYPE):
+        """Return to the main menu, dropping any in-progress flow"""
+        reset_flow(context.user_data)
+        await query.edit_message_text(
+            "🤖 Main Menu\n\nChoose an action:",
+            reply_markup=self._main_menu_keyboard
+        )
+    
+    async def _cb_cal_ignore(self, query, context: ContextTypes.DEFAULT_TYPE):
+        """Ignore taps on calendar labels and blank days"""
+    
+    async def _cb_cal_cancel(self, query, context: ContextTypes.DEFAULT_TYPE):
+        """Cancel the date picker"""
+        reset_flow(context.user_data)
+        await query.edit_message_text(
+            "❌ Cancelled.\n\n🤖 Main Menu",
+            reply_markup=self._main_menu_keyboard
+        )
+    
+    async def _cb_cal_prev(self, query, context: ContextTypes.DEFAULT_TYPE, rest: str):
+        """Move the date picker to the previous month (cal_prev_<year>_<month>)"""
+        year, month = map(int, rest.split("_"))
+        month -= 1
+        if month < 1:
+            month = 12
+            year -= 1
+        keyboard = self.generate_calendar_keyboard(year, month)
+        await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
+    
+    async def _cb_cal_next(self, query, context: ContextTypes.DEFAULT_TYPE, rest: str):
+        """Move the date picker to the next month (cal_next_<year>_<month>)"""
+        year, month = map(int, rest.split("_"))
+        month += 1
+        if month > 12:
+            month = 1
+            year += 1
+        keyboard = self.generate_calendar_keyboard(year, month)
+        await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
+    
+    async def _cb_cal_day(self, query, context: ContextTypes.DEFAULT_TYPE, rest: str):
+        """Store the picked date and ask for the hour (CB_DAY + hex of year<<16 | month<<8 | day)"""
+        packed = int(rest, 16)
+        selected_date = datetime.date(packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF)
         
-        if data == "menu_today":
-            await self.show_today_events(query, context)
-            return
+        # Store the selected date
+        event_data = context.user_data['event_data']
+        event_data['date'] = selected_date
         
-        if data == "menu_search":
-            await query.edit_message_text(
-                "🔍 Please type the event name or keyword you want to search for:",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Cancel", callback_data="menu_back")]])
-            )
-            context.user_data['waiting_for_search'] = True
-            return
+        # Now ask for time
+        await self.show_time_picker(query, context, selected_date)
+    
+    async def _cb_time(self, query, context: ContextTypes.DEFAULT_TYPE, rest: str):
+        """Store the picked hour and ask for the minute (CB_HOUR + hex hour)"""
+        hour = int(rest, 16)
         
-        if data == "menu_edit":
-            await self.show_events_for_edit(query, context)
-            return
+        event_data = context.user_data['event_data']
+        date = event_data['date']
+        event_data['hour'] = hour
         
-        if data == "menu_delete":
-            await self.show_events_for_delete(query, context)
-            return
+        # Show minute picker
+        await self.show_minute_picker(query, context, date, hour)
+    
+    async def _cb_minute(self, query, context: ContextTypes.DEFAULT_TYPE, rest: str):
+        """Store the picked start time, then create the event or ask for a title (CB_MINUTE + hex minute)"""
+        minute = int(rest, 16)
         
-        if data == "menu_back":
-            context.user_data.clear()
-            await query.edit_message_text(
-                "🤖 Main Menu\n\nChoose an action:",
-                reply_markup=self.get_main_menu_keyboard()
-            )
-            return
+        event_data = context.user_data['event_data']
+        date = event_data['date']
+        hour = event_data['hour']
         
-        if data == "cal_ignore":
-            return
+        # Create datetime
+        start_time = datetime.datetime.combine(date, datetime.time(hour, minute))
+        event_data['start_time'] = start_time
         
-        if data == "cal_cancel":
-            context.user_data.clear()
+        # Check if title was already provided
+        title = event_data.get('title')
+        if title:
             await query.edit_message_text(
-                "❌ Cancelled.\n\n🤖 Main Menu",
-                reply_markup=self.get_main_menu_keyboard()
+                f"⏳ Creating event...\n"
+                f"📌 {title}\n"
+                f"⏰ {format_event_time(start_time)}"
             )
-            return
-        
-        if data.startswith("cal_prev_"):
-            _, _, year, month = data.split("_")
-            year, month = int(year), int(month)
-            month -= 1
-            if month < 1:
-                month = 12
-                year -= 1
-            keyboard = self.generate_calendar_keyboard(year, month)
-            await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
-            return
-        
-        if data.startswith("cal_next_"):
-            _, _, year, month = data.split("_")
-            year, month = int(year), int(month)
-            month += 1
-            if month > 12:
-                month = 1
-                year += 1
-            keyboard = self.generate_calendar_keyboard(year, month)
-            await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
-            return
-        
-        if data.startswith("cal_day_"):
-            _, _, year, month, day = data.split("_")
-            selected_date = datetime.date(int(year), int(month), int(day))
-            
-            # Store the selected date
-            context.user_data['event_data']['date'] = selected_date
-            
-            # Now ask for time
-            await self.show_time_picker(query, context, selected_date)
-            return
-        
-        if data.startswith("time_"):
-            _, hour = data.split("_")
-            hour = int(hour)
-            
-            date = context.user_data['event_data']['date']
-            context.user_data['event_data']['hour'] = hour
-            
-            # Show minute picker
-            await self.show_minute_picker(query, context, date, hour)
-            return
-        
-        if data.startswith("min_"):
-            _, minute = data.split("_")
-            minute = int(minute)
-            
-            date = context.user_data['event_data']['date']
-            hour = context.user_data['event_data']['hour']
-            
-            # Create datetime
-            start_time = datetime.datetime.combine(date, datetime.time(hour, minute))
-            context.user_data['event_data']['start_time'] = start_time
-            
-            # Check if title was already provided
-            if context.user_data['event_data'].get('title'):
-                title = context.user_data['event_data']['title']
-                await query.edit_message_text(
-                    f"⏳ Creating event...\n"
-                    f"📌 {title}\n"
-                    f"⏰ {start_time.strftime('%B %d, %Y at %I:%M %p')}"
-                )
-                # Create event directly
-                await self.create_event_now(query, context, title)
-            else:
-                # Ask for event title
-                await query.edit_message_text(
-                    f"✅ Date & Time: {start_time.strftime('%B %d, %Y at %I:%M %p')}\n\n"
-                    "📝 Please enter the event title/description:"
-                )
-                context.user_data['waiting_for_title'] = True
-            return
-        
-        if data.startswith("delete_"):
-            event_id = data.replace("delete_", "")
-            
-            # Confirm deletion
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("✅ Yes, Delete", callback_data=f"confirm_delete_{event_id}"),
-                    InlineKeyboardButton("❌ Cancel", callback_data="menu_back")
-                ]
-            ])
+            # Create event directly, in the background so the update is released immediately
+            context.application.create_task(self.create_event_now(query, context, title))
+        else:
+            # Ask for event title
             await query.edit_message_text(
-                "⚠️ Are you sure you want to delete this event?",
-                reply_markup=keyboard
+                f"✅ Date & Time: {format_event_time(start_time)}\n\n"
+                "📝 Please enter the event title/description:"
             )
-            return
-        
-        if data.startswith("confirm_delete_"):
-            event_id = data.replace("confirm_delete_", "")
-            result = self.calendar_manager.delete_event(event_id)
-            
-            if result.get('success'):
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("📅 View Upcoming", callback_data="menu_upcoming")],
-                    [InlineKeyboardButton("🗑️ Delete Another", callback_data="menu_delete")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
-                await query.edit_message_text(
-                    "✅ Event deleted successfully!",
-                    reply_markup=keyboard
-                )
-            else:
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔄 Try Again", callback_data="menu_delete")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
-                await query.edit_message_text(
-                    f"❌ Failed to delete event: {result.get('error')}",
-                    reply_markup=keyboard
-                )
-            return
-        
-        if data.startswith("edit_"):
-            event_id = data.replace("edit_", "")
-            context.user_data['editing_event_id'] = event_id
-            
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("📝 Change Title", callback_data=f"edit_title_{event_id}")],
-                [InlineKeyboardButton("⏰ Change Time", callback_data=f"edit_time_{event_id}")],
-                [InlineKeyboardButton("🔙 Back", callback_data="menu_edit")]
-            ])
+            context.user_data['waiting_for_title'] = True
+    
+    async def _cb_delete(self, query, context: ContextTypes.DEFAULT_TYPE, event_id: str):
+        """Ask for confirmation before deleting an event (delete_<id>)"""
+        await query.edit_message_text(
+            "⚠️ Are you sure you want to delete this event?",
+            reply_markup=build_delete_confirm_keyboard(event_id)
+        )
+    
+    async def _cb_confirm_delete(self, query, context: ContextTypes.DEFAULT_TYPE, event_id: str):
+        """Delete a confirmed event (confirm_delete_<id>)"""
+        # Give feedback right away and finish the Cal.com call in the background
+        await query.edit_message_text("⏳ Deleting event...")
+        context.application.create_task(self._finish_delete(query, event_id))
+    
+    async def _finish_delete(self, query, event_id: str):
+        """Delete an event and report the result on the confirmation message"""
+        try:
+            result = await self._run(self.calendar_manager.delete_event, event_id)
             
+            success = bool(result.get('success'))
+            if success:
+                self._invalidate_calendar_cache()
+            text, keyboard = _DELETE_REPLIES[success]
             await query.edit_message_text(
-                "What would you like to edit?",
+                text.format(error=result.get('error')),
                 reply_markup=keyboard
             )
-            return
+        except Exception as e:
+            # Runs as a background task, so nothing else would report the failure;
+            # the event may be gone even if the call failed, so drop cached reads
+            logger.exception("Error deleting event %s", event_id)
+            self._invalidate_calendar_cache()
+            text, keyboard = _DELETE_REPLIES[False]
+            try:
+                await query.edit_message_text(text.format(error=e), reply_markup=keyboard)
+            except Exception:
+                logger.exception("Could not report the failed delete of event %s", event_id)
+    
+    async def _cb_edit(self, query, context: ContextTypes.DEFAULT_TYPE, event_id: str):
+        """Show the edit options for an event (edit_<id>)"""
+        context.user_data['editing_event_id'] = event_id
         
-        if data.startswith("edit_title_"):
-            event_id = data.replace("edit_title_", "")
-            context.user_data['editing_event_id'] = event_id
-            context.user_data['waiting_for_new_title'] = True
-            
-            await query.edit_message_text(
-                "📝 Please enter the new event title:",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Cancel", callback_data="menu_back")]])
-            )
-            return
+        await query.edit_message_text(
+            "What would you like to edit?",
+            reply_markup=build_edit_choice_keyboard(event_id)
+        )
+    
+    async def _cb_edit_title(self, query, context: ContextTypes.DEFAULT_TYPE, event_id: str):
+        """Ask for a new event title (edit_title_<id>)"""
+        context.user_data['editing_event_id'] = event_id
+        context.user_data['waiting_for_new_title'] = True
         
-        if data.startswith("edit_time_"):
-            await query.edit_message_text(
-                "⏰ Time editing feature coming soon!\n\nFor now, you can delete and recreate the event.",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]])
-            )
-            return
+        await query.edit_message_text(
+            "📝 Please enter the new event title:",
+            reply_markup=_KB_CANCEL_TO_MENU
+        )
+    
+    async def _cb_edit_time(self, query, context: ContextTypes.DEFAULT_TYPE, event_id: str):
+        """Explain that time editing is not available yet (edit_time_<id>)"""
+        await query.edit_message_text(
+            "⏰ Time editing feature coming soon!\n\nFor now, you can delete and recreate the event.",
+            reply_markup=self.BACK_TO_MENU_KEYBOARD
+        )
     
     async def show_time_picker(self, query, context: ContextTypes.DEFAULT_TYPE, date: datetime.date):
         """Show time picker (hours)"""
-        keyboard = []
-        
-        # Morning hours
-        keyboard.append([
-            InlineKeyboardButton(f"{h}:00", callback_data=f"time_{h}")
-            for h in range(6, 12)
-        ])
-        
-        # Afternoon hours
-        keyboard.append([
-            InlineKeyboardButton(f"{h}:00", callback_data=f"time_{h}")
-            for h in range(12, 18)
-        ])
-        
-        # Evening hours
-        keyboard.append([
-            InlineKeyboardButton(f"{h}:00", callback_data=f"time_{h}")
-            for h in range(18, 24)
-        ])
-        
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
-        
         await query.edit_message_text(
-            f"📅 Selected: {date.strftime('%B %d, %Y')}\n\n"
+            f"📅 Selected: {format_event_date(date)}\n\n"
             "🕐 Select the hour:",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=_KB_HOUR_PICKER
         )
     
     async def show_minute_picker(self, query, context: ContextTypes.DEFAULT_TYPE, date: datetime.date, hour: int):
         """Show minute picker"""
-        keyboard = []
-        
-        # Minutes in 15-minute intervals
-        keyboard.append([
-            InlineKeyboardButton(f"{hour}:{m:02d}", callback_data=f"min_{m}")
-            for m in [0, 15, 30, 45]
-        ])
-        
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
-        
         await query.edit_message_text(
-            f"📅 Selected: {date.strftime('%B %d, %Y')}\n"
+            f"📅 Selected: {format_event_date(date)}\n"
             f"🕐 Hour: {hour}:00\n\n"
             "⏰ Select the minutes:",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=_KB_MINUTE_PICKER[hour]
         )
     
     async def create_event_now(self, query_or_update, context: ContextTypes.DEFAULT_TYPE, title: str):
         """Create event immediately"""
         try:
-            start_time = context.user_data['event_data']['start_time']
+            event_data = context.user_data.get('event_data') or {}
+            start_time = event_data['start_time']
             end_time = start_time + datetime.timedelta(hours=1)  # Default 1 hour duration
             
             # Create the event
-            result = self.calendar_manager.create_event(
+            result = await self._run(
+                self.calendar_manager.create_event,
                 summary=title,
                 start_time=start_time,
                 end_time=end_time,
@@ -927,50 +1285,45 @@ Examples:
             )
             
             if result.get('success'):
-                response = f"✅ Event created successfully!\n\n"
-                response += f"📌 {title}\n"
-                response += f"⏰ {start_time.strftime('%B %d, %Y at %I:%M %p')}\n"
-                response += f"⏱️ Duration: 1 hour\n"
-                if result.get('link'):
-                    response += f"🔗 {result['link']}"
+                self._invalidate_calendar_cache()
+                link = f"🔗 {result['link']}" if result.get('link') else ""
+                response = (
+                    f"✅ Event created successfully!\n\n"
+                    f"📌 {title}\n"
+                    f"⏰ {format_event_time(start_time)}\n"
+                    f"⏱️ Duration: 1 hour\n"
+                    f"{link}"
+                )
             else:
                 response = f"❌ Failed to create event: {result.get('error', 'Unknown error')}"
             
             # Add action buttons
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("➕ Add Another", callback_data="menu_add")],
-                [InlineKeyboardButton("📅 View Upcoming", callback_data="menu_upcoming")],
-                [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-            ])
+            keyboard = _KB_POST_CREATE
             
-            # Send response - determine correct method based on object type
-            if hasattr(query_or_update, 'edit_message_text'):
-                # It's a CallbackQuery
-                await query_or_update.edit_message_text(response, reply_markup=keyboard)
-            elif hasattr(query_or_update, 'message'):
-                # It's an Update object
-                await query_or_update.message.reply_text(response, reply_markup=keyboard)
-            else:
-                # Fallback
-                await query_or_update.reply_text(response, reply_markup=keyboard)
+            await self._reply(query_or_update, response, keyboard)
             
             # Clear user data
-            context.user_data.clear()
+            reset_flow(context.user_data)
         
         except Exception as e:
             logger.error(f"Error creating event: {e}")
             error_msg = "❌ Sorry, I encountered an error creating the event. Please try again."
             
-            keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]])
+            keyboard = self.BACK_TO_MENU_KEYBOARD
             
-            if hasattr(query_or_update, 'edit_message_text'):
-                await query_or_update.edit_message_text(error_msg, reply_markup=keyboard)
-            elif hasattr(query_or_update, 'message'):
-                await query_or_update.message.reply_text(error_msg, reply_markup=keyboard)
-            else:
-                await query_or_update.reply_text(error_msg, reply_markup=keyboard)
+            await self._reply(query_or_update, error_msg, keyboard)
             
-            context.user_data.clear()
+            reset_flow(context.user_data)
+    
+    @staticmethod
+    async def _reply(target, text: str, keyboard):
+        """Send text to a CallbackQuery (edit in place), an Update (reply) or a Message"""
+        if isinstance(target, CallbackQuery):
+            await target.edit_message_text(text, reply_markup=keyboard)
+        elif isinstance(target, Update):
+            await target.message.reply_text(text, reply_markup=keyboard)
+        else:
+            await target.reply_text(text, reply_markup=keyboard)
     
     async def process_event_creation(self, update: Update, context: ContextTypes.DEFAULT_TYPE, title: str):
         """Process the final event creation with title from message"""
@@ -981,23 +1334,14 @@ Examples:
         context.user_data.pop('waiting_for_search', None)
         
         try:
-            events = self.calendar_manager.search_events(query_text)
+            events = await self._search_events(query_text)
             
             if events:
-                response = f"🔍 Found {len(events)} event(s) matching '{query_text}':\n\n"
-                response += self.ai_agent.format_events_for_display(events)
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔍 Search Again", callback_data="menu_search")],
-                    [InlineKeyboardButton("📅 View All", callback_data="menu_upcoming")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                response = f"🔍 Found {len(events)} event(s) matching '{query_text}':\n\n{self.ai_agent.format_events_for_display(events)}"
+                keyboard = _KB_SEARCH_FOUND
             else:
                 response = f"🔍 No events found matching '{query_text}'."
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔍 Search Again", callback_data="menu_search")],
-                    [InlineKeyboardButton("➕ Add Event", callback_data="menu_add")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                keyboard = _KB_SEARCH_NONE
             
             await update.message.reply_text(response, reply_markup=keyboard)
         except Exception as e:
@@ -1007,31 +1351,26 @@ Examples:
     async def process_title_edit(self, update: Update, context: ContextTypes.DEFAULT_TYPE, new_title: str):
         """Process event title edit"""
         event_id = context.user_data.get('editing_event_id')
-        context.user_data.clear()
+        reset_flow(context.user_data)
         
         if not event_id:
             await update.message.reply_text("❌ Error: Event ID not found.")
             return
         
         try:
-            result = self.calendar_manager.update_event(
+            result = await self._run(
+                self.calendar_manager.update_event,
                 event_id=event_id,
                 summary=new_title
             )
             
             if result.get('success'):
+                self._invalidate_calendar_cache()
                 response = f"✅ Event title updated to: {new_title}"
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("✏️ Edit Another", callback_data="menu_edit")],
-                    [InlineKeyboardButton("📅 View Upcoming", callback_data="menu_upcoming")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                keyboard = _KB_POST_EDIT_OK
             else:
                 response = f"❌ Failed to update event: {result.get('error')}"
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔄 Try Again", callback_data="menu_edit")],
-                    [InlineKeyboardButton("🔙 Back to Menu", callback_data="menu_back")]
-                ])
+                keyboard = _KB_POST_EDIT_FAIL
             
             await update.message.reply_text(response, reply_markup=keyboard)
         except Exception as e:
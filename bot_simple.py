@@ -2,49 +2,293 @@
 Telegram Bot Module - Simple Keyboard Version
 Handles all Telegram interactions with regular keyboard buttons
 """
+import re
+import time
+import queue
+import atexit
+import asyncio
 import logging
+import logging.handlers
+import weakref
 import datetime
+import functools
 import calendar as cal_module
-from telegram import Update, KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, KeyboardButton, ReplyKeyboardMarkup, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
+    PicklePersistence,
+    PersistenceInput,
     filters,
     ContextTypes
 )
 from ai_agent import AIAgent
 from calendar_manager import CalendarManager
+from calendar_cache import CalendarCache
 from task_note_manager import TaskNoteManager
-from config import TELEGRAM_BOT_TOKEN, TELEGRAM_USER_ID, BOT_NAME, ADMIN_USER_ID
-from translations import get_text, get_user_language, set_user_language
+from config import TELEGRAM_BOT_TOKEN, TELEGRAM_USER_ID, BOT_NAME, ADMIN_USER_ID, PERSISTENCE_FILE
+from translations import LANGUAGES, get_text, set_user_language
 
-# Enable logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# uvloop is optional (not available on Windows); fall back to the default asyncio loop
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Enable logging; handlers only enqueue records and a listener thread writes them out
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_enqueue = logging.handlers.QueueHandler(_log_queue)
+_log_enqueue.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(handlers=[_log_enqueue], level=logging.INFO)
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# Seconds a cached calendar read is reused before Cal.com is queried again
+CALENDAR_CACHE_TTL = 20
+
+# Telegram splits long pasted notes into several messages sent back to back;
+# parts arriving within this many seconds of the first are saved as one note
+NOTE_DEBOUNCE_SECONDS = 0.25
+
+# Flow state is persisted across restarts; a flow step left unanswered this long
+# is dropped so a later message isn't taken as its answer
+FLOW_TTL_SECONDS = 15 * 60
+
+# user_data keys owned by the flows; the language preference is kept when a flow expires
+_FLOW_KEYS = ('flow', 'flow_started', 'event_data', 'note_data', 'events_list')
+
+
+def start_flow(user_data: dict, flow: str):
+    """Enter a flow step, stamping when it started so an abandoned flow can expire"""
+    user_data['flow'] = flow
+    user_data['flow_started'] = time.time()
+
+
+def expire_flow(user_data: dict) -> bool:
+    """
+    Drop the flow state if its current step started more than FLOW_TTL_SECONDS ago
+    
+    Args:
+        user_data: User's context data
+    
+    Returns:
+        True if a stale flow was dropped
+    """
+    if not user_data.get('flow'):
+        return False
+    if time.time() - user_data.get('flow_started', 0) <= FLOW_TTL_SECONDS:
+        return False
+    for key in _FLOW_KEYS:
+        user_data.pop(key, None)
+    return True
+
+# Times typed in the create flow: 14:30, 14.30, 1430, 2:30 PM, 2:30pm, 2 pm
+_TIME_RE = re.compile(r"^\s*(\d{1,2})(?:[:.]?(\d{2}))?\s*([AaPp][Mm])?\s*$")
+
+
+def parse_time_of_day(text: str):
+    """
+    Parse a user-typed time of day in one regex match
+    
+    Args:
+        text: Time as typed by the user
+    
+    Returns:
+        datetime.time, or None if the text is not a valid time
+    """
+    match = _TIME_RE.match(text)
+    if not match:
+        return None
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    meridiem = match.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return datetime.time(hour, minute)
+
+
+# Messages whose intent is unambiguous, resolved to the same (action, parameters)
+# schema as the AI analysis without calling the LLM. Patterns must match the whole
+# normalized message, so "delete today's meeting" still goes to the AI.
+_INTENT_FINGERPRINTS = (
+    (re.compile(r"(what'?s on )?(my )?(calendar |schedule |events )?(for )?today('?s (events|schedule))?"),
+     'get_date_events', 0),
+    (re.compile(r"(what'?s on )?(my )?(calendar |schedule |events )?(for )?tomorrow('?s (events|schedule))?"),
+     'get_date_events', 1),
+    (re.compile(r"(show |list )?(my )?(upcoming|next)( events)?|(show |list )(my )?events"),
+     'list_events', None),
+)
+
+
+def match_intent_fingerprint(text: str):
+    """
+    Resolve an obvious request without the LLM
+    
+    Args:
+        text: The user's message
+    
+    Returns:
+        Analysis dict like AIAgent.analyze_user_request, or None if no fingerprint matches
+    """
+    normalized = text.strip().lower().rstrip('?!. ')
+    for pattern, action, day_offset in _INTENT_FINGERPRINTS:
+        if pattern.fullmatch(normalized):
+            if day_offset is None:
+                return {'action': action, 'parameters': {}}
+            date = datetime.date.today() + datetime.timedelta(days=day_offset)
+            return {'action': action, 'parameters': {'date': date.isoformat()}}
+    return None
+
+
+# Inline buttons that are identical in every picker, shared instead of rebuilt per render
+_DAY_HEADER_ROW = tuple(
+    InlineKeyboardButton(day, callback_data="cal_ignore")
+    for day in ("Mo", "Tu", "We", "Th", "Fr", "Sa", "Su")
+)
+_EMPTY_CELL = InlineKeyboardButton(" ", callback_data="cal_ignore")
+_CANCEL_INLINE = InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")
+
+@functools.lru_cache(maxsize=512)
+def build_delete_button(event_id, title: str, start: str) -> InlineKeyboardButton:
+    """Build the delete button for one event; repeated delete screens reuse it"""
+    return InlineKeyboardButton(f"🗑️ {title[:30]} - {start[:16]}", callback_data=f"delete_{event_id}")
+
+
+# Dates typed in the create flow: YYYY-MM-DD
+_DATE_RE = re.compile(r"\s*\d{4}-\d{2}-\d{2}\s*")
+_RELATIVE_DAYS = {'today': 0, 'tomorrow': 1}
+
+
+def parse_event_date(text: str):
+    """
+    Parse a user-typed event date without raising on malformed input
+    
+    Args:
+        text: 'today', 'tomorrow' or a YYYY-MM-DD date
+    
+    Returns:
+        datetime.date, or None if the text is not a valid date
+    """
+    offset = _RELATIVE_DAYS.get(text.strip().lower())
+    if offset is not None:
+        return datetime.date.today() + datetime.timedelta(days=offset)
+    if not _DATE_RE.fullmatch(text):
+        return None
+    try:
+        # The pattern guarantees the shape, but not a real calendar day (e.g. 2025-02-30)
+        return datetime.date.fromisoformat(text.strip())
+    except ValueError:
+        return None
+
+
+# Inline callback_data of the form "<action>_<payload>"; the action selects the handler
+_CALLBACK_RE = re.compile(
+    r"^(lang|cal_prev|cal_next|cal_day|time|delete|task_complete|task_delete|note_view|note_delete)_(.*)$"
+)
+
+
+# Static /help text (Markdown)
+HELP_MESSAGE = """
+📖 *Help & Commands*
+
+*Button Actions:*
+➕ Add Event - Create a new calendar event
+📅 Upcoming - View your upcoming events
+📋 Today - See today's schedule
+🔍 Search - Find specific events
+✏️ Edit Event - Modify an existing event
+🗑️ Delete Event - Remove an event
+
+*Natural Language:*
+You can also just type naturally:
+• "Create meeting tomorrow at 3pm"
+• "What do I have scheduled?"
+• "Delete my dentist appointment"
+
+Type /menu anytime to show the main menu.
+"""
+
+_CALENDAR_DISABLED_MSG = "❌ Calendar features are disabled."
+
+
+def requires_calendar(handler):
+    """Reply with the disabled notice instead of running handler when Cal.com is not connected"""
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        if not self.calendar_enabled:
+            user_id = update.effective_user.id
+            lang = self._lang(context)
+            await self._reply(update.message, lang, user_id, _CALENDAR_DISABLED_MSG)
+            return
+        return await handler(self, update, context, *args, **kwargs)
+    return wrapper
+
 
 class TelegramBot:
     """Telegram bot handler with AI integration"""
     
+    # Menu button labels, in every language, that only the admin may use (all but the language switch)
+    _ADMIN_ONLY_BUTTONS = frozenset(
+        label
+        for texts in LANGUAGES.values()
+        for key, label in texts.items()
+        if key.startswith('btn_') and key not in ('btn_language', 'btn_cancel')
+    )
+    
     def __init__(self):
         self.ai_agent = AIAgent()
         self.calendar_manager = CalendarManager()
         self.task_note_manager = TaskNoteManager()
         self.calendar_enabled = self.calendar_manager.is_connected()
-        self.app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        # Reply keyboards are immutable, so each variant is built once and reused
+        self._menu_keyboards = {}
+        self._cancel_keyboards = {}
+        self._welcome_messages = {}
+        # Warm the menu cache for every shipped language so replies never build one
+        for lang in LANGUAGES:
+            for user_id in (ADMIN_USER_ID, None):
+                self.get_main_menu_keyboard(lang, user_id)
+        self._cancel_kb = ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
+        self._calendar_cache = CalendarCache(CALENDAR_CACHE_TTL)
+        self._note_buffers = {}
+        self._build_dispatch_tables()
+        # Locks are dropped once no handler of that chat holds them
+        self._chat_locks = weakref.WeakValueDictionary()
+        # Only user_data holds flow state; the other stores are unused
+        persistence = PicklePersistence(
+            filepath=PERSISTENCE_FILE,
+            store_data=PersistenceInput(chat_data=False, bot_data=False, callback_data=False)
+        )
+        self.app = (
+            Application.builder()
+            .token(TELEGRAM_BOT_TOKEN)
+            .persistence(persistence)
+            # Updates from different chats are handled in parallel; handle_message and
+            # handle_callback take a per-chat lock so one chat's updates stay in order
+            .concurrent_updates(True)
+            .build()
+        )
         self.setup_handlers()
         
         if not self.calendar_enabled:
-            print("\n⚠️  Bot started in LIMITED MODE - Calendar features disabled")
-            print("📝 The bot will work but cannot manage calendar bookings")
-            print("✅ To enable full features, add CALCOM_API_KEY to .env and restart\n")
+            logger.warning(
+                "Bot started in LIMITED MODE - Calendar features disabled. "
+                "The bot will work but cannot manage calendar bookings; "
+                "add CALCOM_API_KEY to .env and restart to enable full features"
+            )
         else:
-            print("\n✅ Bot started successfully with full Cal.com calendar features\n")
+            logger.info("Bot started successfully with full Cal.com calendar features")
     
     def setup_handlers(self):
         """Set up command and message handlers"""
@@ -54,13 +298,102 @@ class TelegramBot:
         self.app.add_handler(CallbackQueryHandler(self.handle_callback))
         self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
     
+    def _build_dispatch_tables(self):
+        """Map keyboard button labels and flow names to their handlers"""
+        # Translation key of each menu button -> handler(update, context)
+        button_keys = {
+            'btn_add_event': self.handle_add_event,
+            'btn_upcoming': self.handle_upcoming,
+            'btn_today': self.handle_today,
+            'btn_search': self.handle_search_request,
+            'btn_edit': self.handle_edit_request,
+            'btn_delete': self.handle_delete_request,
+            'btn_language': self.show_language_selection,
+            'btn_add_task': self.handle_add_task,
+            'btn_list_tasks': self.handle_list_tasks,
+            'btn_add_note': self.handle_add_note,
+            'btn_list_notes': self.handle_list_notes,
+        }
+        # Button label in every language -> handler
+        self._button_handlers = {
+            texts[key]: handler
+            for texts in LANGUAGES.values()
+            for key, handler in button_keys.items()
+            if key in texts
+        }
+        # Cancel keyboard labels, including the untranslated one used by the older flows
+        self._cancel_labels = frozenset(
+            [texts['btn_cancel'] for texts in LANGUAGES.values() if 'btn_cancel' in texts] + ["❌ Cancel"]
+        )
+        
+        # Callback action -> handler(query, context, lang, user_id, payload)
+        self._callback_handlers = {
+            'lang': self._cb_language,
+            'cal_prev': self._cb_cal_prev,
+            'cal_next': self._cb_cal_next,
+            'cal_day': self._cb_cal_day,
+            'time': self._cb_time,
+            'delete': self._cb_delete_event,
+            'task_complete': self._cb_task_complete,
+            'task_delete': self._cb_task_delete,
+            'note_view': self._cb_note_view,
+            'note_delete': self._cb_note_delete,
+        }
+        
+        # Active flow name -> handler(update, context, user_message)
+        self._flow_handlers = {
+            'create_event': self.handle_create_event_flow,
+            'create_event_title': self.handle_create_event_with_title,
+            'search': self.handle_search_flow,
+            'delete': self.handle_delete_flow,
+            'edit': self.handle_edit_flow,
+            'add_task': self.handle_add_task_flow,
+            'add_note_title': self.handle_add_note_title_flow,
+            'add_note_content': self.handle_add_note_content_flow,
+        }
+    
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking call (Cal.com HTTP request) in a worker thread so the event loop stays free"""
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    async def _get_upcoming_events(self, max_results: int = 10) -> list:
+        """Get upcoming events through the calendar cache"""
+        return await self._calendar_cache.call(
+            ('upcoming', max_results), self.calendar_manager.get_upcoming_events, max_results=max_results
+        )
+    
+    async def _get_events_for_date(self, date: datetime.date) -> list:
+        """Get the events on a date through the calendar cache"""
+        return await self._calendar_cache.call(('date', date), self.calendar_manager.get_events_for_date, date)
+    
+    def _invalidate_calendar_cache(self):
+        """Drop cached calendar reads after a booking is created or deleted"""
+        self._calendar_cache.clear()
+    
+    @staticmethod
+    def _lang(context: ContextTypes.DEFAULT_TYPE) -> str:
+        """Get the user's language straight from user_data (get_user_language without the unused user id)"""
+        return context.user_data.get('language', 'en')
+    
+    def _chat_lock(self, chat_id: int) -> asyncio.Lock:
+        """Get the lock serializing update handling within one chat"""
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_locks[chat_id] = asyncio.Lock()
+        return lock
+    
     def is_admin(self, user_id: int) -> bool:
         """Check if user is admin"""
         return user_id == ADMIN_USER_ID
     
     def get_main_menu_keyboard(self, lang='en', user_id=None):
         """Generate main menu keyboard based on user role"""
-        if user_id == ADMIN_USER_ID:
+        is_admin = user_id == ADMIN_USER_ID
+        markup = self._menu_keyboards.get((lang, is_admin))
+        if markup is not None:
+            return markup
+        
+        if is_admin:
             # Admin gets full menu
             keyboard = [
                 [get_text(lang, 'btn_add_event'), get_text(lang, 'btn_upcoming')],
@@ -75,152 +408,109 @@ class TelegramBot:
             keyboard = [
                 [get_text(lang, 'btn_language')]
             ]
-        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
+        markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
+        self._menu_keyboards[(lang, is_admin)] = markup
+        return markup
+    
+    async def _reply(self, message, lang: str, user_id: int, text: str, **kwargs):
+        """Reply to message with the cached main menu keyboard attached
+
+        Args:
+            message: Message to reply to (update.message or query.message)
+            lang: User's language code
+            user_id: Telegram user ID, used to pick the admin or regular menu
+            text: Reply text
+            **kwargs: Extra arguments for reply_text (e.g. parse_mode)
+        """
+        return await message.reply_text(text, reply_markup=self.get_main_menu_keyboard(lang, user_id), **kwargs)
+    
+    def get_cancel_keyboard(self, lang='en'):
+        """Get the one-button cancel keyboard in the user's language"""
+        markup = self._cancel_keyboards.get(lang)
+        if markup is None:
+            markup = ReplyKeyboardMarkup([[get_text(lang, 'btn_cancel')]], resize_keyboard=True, one_time_keyboard=True)
+            self._cancel_keyboards[lang] = markup
+        return markup
+    
+    def get_welcome_message(self, lang: str, is_admin: bool) -> str:
+        """Get the /start text; it only varies by language and role, so each variant is formatted once"""
+        message = self._welcome_messages.get((lang, is_admin))
+        if message is None:
+            if is_admin:
+                calendar_status = "" if self.calendar_enabled else get_text(lang, 'welcome_limited')
+                message = get_text(lang, 'welcome', bot_name=BOT_NAME, calendar_status=calendar_status)
+            else:
+                message = get_text(lang, 'welcome_user', bot_name=BOT_NAME)
+            self._welcome_messages[(lang, is_admin)] = message
+        return message
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
-        if self.is_admin(user_id):
-            calendar_status = "" if self.calendar_enabled else get_text(lang, 'welcome_limited')
-            welcome_message = get_text(lang, 'welcome', bot_name=BOT_NAME, calendar_status=calendar_status)
-        else:
-            welcome_message = get_text(lang, 'welcome_user', bot_name=BOT_NAME)
-        
-        await update.message.reply_text(
-            welcome_message,
-            reply_markup=self.get_main_menu_keyboard(lang, user_id)
-        )
-        logger.info(f"User {user_id} started the bot")
+        await self._reply(update.message, lang, user_id, self.get_welcome_message(lang, self.is_admin(user_id)))
+        logger.info("User %s started the bot", user_id)
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        help_message = """
-📖 *Help & Commands*
-
-*Button Actions:*
-➕ Add Event - Create a new calendar event
-📅 Upcoming - View your upcoming events
-📋 Today - See today's schedule
-🔍 Search - Find specific events
-✏️ Edit Event - Modify an existing event
-🗑️ Delete Event - Remove an event
-
-*Natural Language:*
-You can also just type naturally:
-• "Create meeting tomorrow at 3pm"
-• "What do I have scheduled?"
-• "Delete my dentist appointment"
-
-Type /menu anytime to show the main menu.
-"""
-        await update.message.reply_text(
-            help_message,
-            parse_mode='Markdown',
-            reply_markup=self.get_main_menu_keyboard(lang, user_id)
-        )
+        lang = self._lang(context)
+        await self._reply(update.message, lang, user_id, HELP_MESSAGE, parse_mode='Markdown')
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle text messages including keyboard buttons"""
+        """Handle text messages including keyboard buttons, one at a time per chat"""
+        async with self._chat_lock(update.effective_chat.id):
+            await self._handle_message(update, context)
+    
+    async def _handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route a text message to its button, cancel, flow or AI handler"""
         user_message = update.message.text
         user_id = update.effective_user.id
         
-        logger.info(f"Received message from {user_id}: {user_message}")
+        logger.info("Received message from %s: %s", user_id, user_message)
         
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
         # Handle keyboard button presses (English and Persian)
-        if user_message in ["➕ Add Event", "➕ رویداد جدید"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_add_event(update, context)
-            return
-        elif user_message in ["📅 Upcoming", "📅 رویدادهای آینده"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_upcoming(update, context)
-            return
-        elif user_message in ["📋 Today", "📋 امروز"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_today(update, context)
-            return
-        elif user_message in ["🔍 Search", "🔍 جستجو"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_search_request(update, context)
-            return
-        elif user_message in ["✏️ Edit Event", "✏️ ویرایش"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_edit_request(update, context)
-            return
-        elif user_message in ["🗑️ Delete Event", "🗑️ حذف رویداد"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_delete_request(update, context)
-            return
-        elif user_message in ["🌐 Language", "🌐 زبان"]:
-            await self.show_language_selection(update, context)
-            return
-        elif user_message in ["✅ Add Task", "✅ وظیفه جدید"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
+        handler = self._button_handlers.get(user_message)
+        if handler:
+            if user_message in self._ADMIN_ONLY_BUTTONS and not self.is_admin(user_id):
+                await self._reply(update.message, lang, user_id, get_text(lang, 'admin_only'))
                 return
-            await self.handle_add_task(update, context)
+            await handler(update, context)
             return
-        elif user_message in ["📝 My Tasks", "📝 وظایف من"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_list_tasks(update, context)
-            return
-        elif user_message in ["📒 Add Note", "📒 یادداشت جدید"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_add_note(update, context)
-            return
-        elif user_message in ["📚 My Notes", "📚 یادداشت‌های من"]:
-            if not self.is_admin(user_id):
-                await update.message.reply_text(get_text(lang, 'admin_only'), reply_markup=self.get_main_menu_keyboard(lang, user_id))
-                return
-            await self.handle_list_notes(update, context)
+        
+        # Cancel in any language ends the current flow (if any) without asking the AI
+        if user_message in self._cancel_labels:
+            context.user_data.clear()
+            await self._reply(update.message, lang, user_id, get_text(lang, 'cancelled'))
             return
         
-        # Check if we're in a flow
-        if context.user_data.get('flow'):
+        # Check if we're in a flow (one abandoned long ago, e.g. before a restart, is dropped)
+        if not expire_flow(context.user_data) and context.user_data.get('flow'):
             await self.handle_flow(update, context, user_message)
             return
         
-        # Send typing indicator
-        await update.message.chat.send_action(action="typing")
-        
+        await self._answer_with_ai(update, context, user_message, lang, user_id)
+    
+    async def _answer_with_ai(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str, lang: str, user_id: int):
+        """Classify a free-text message and run the matching action"""
         try:
-            # Analyze the user's request with AI
-            analysis = self.ai_agent.analyze_user_request(user_message)
+            analysis = match_intent_fingerprint(user_message)
+            if analysis is None:
+                # Analyze the user's request with AI while the typing indicator is being sent
+                analysis, _ = await asyncio.gather(
+                    self.ai_agent.aanalyze_user_request(user_message),
+                    update.message.chat.send_action(action="typing")
+                )
             action = analysis.get('action', 'general_chat')
             params = analysis.get('parameters', {})
             
-            logger.info(f"AI Analysis - Action: {action}, Params: {params}")
+            logger.info("AI Analysis - Action: %s, Params: %s", action, params)
             
             # Handle different actions
             if action == 'create_event':
-                if not self.calendar_enabled:
-                    await update.message.reply_text(
-                        "❌ Calendar features are disabled. Please add CALCOM_API_KEY to your .env file and restart the bot.",
-                        reply_markup=self.get_main_menu_keyboard(lang, user_id)
-                    )
-                    return
                 await self.handle_add_event(update, context, params.get('title', ''))
                 return
             
@@ -230,163 +520,127 @@ Type /menu anytime to show the main menu.
             
             elif action == 'get_date_events':
                 date = params.get('date')
-                if date:
-                    events = self.calendar_manager.get_events_for_date(date)
+                # The LLM doesn't always return YYYY-MM-DD ("next Friday", "15/10", a full timestamp)
+                day = parse_event_date(date) if isinstance(date, str) else None
+                if day is None and date:
+                    parsed = await self.ai_agent.aparse_datetime(str(date))
+                    day = parsed.date() if parsed else None
+                if day:
+                    events = await self._get_events_for_date(day)
                     if events:
-                        response = f"📅 Events for {date}:\n\n"
-                        response += self.ai_agent.format_events_for_display(events)
+                        response = f"📅 Events for {date}:\n\n{self.ai_agent.format_events_for_display(events)}"
                     else:
                         response = f"No events scheduled for {date}."
                 else:
                     response = "Please specify a date."
-                await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+                await self._reply(update.message, lang, user_id, response)
                 return
             
             elif action == 'search_events':
                 query = params.get('query', '')
                 if query:
-                    events = self.calendar_manager.search_events(query)
+                    events = await self._run(self.calendar_manager.search_events, query)
                     if events:
-                        response = f"🔍 Found events matching '{query}':\n\n"
-                        response += self.ai_agent.format_events_for_display(events)
+                        response = f"🔍 Found events matching '{query}':\n\n{self.ai_agent.format_events_for_display(events)}"
                     else:
                         response = f"No events found matching '{query}'."
                 else:
                     await self.handle_search_request(update, context)
                     return
-                await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+                await self._reply(update.message, lang, user_id, response)
                 return
             
             elif action == 'general_chat':
                 response = params.get('response_text', '')
                 if not response:
-                    response = self.ai_agent.generate_response(user_message)
-                await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+                    response = await self.ai_agent.agenerate_response(user_message)
+                await self._reply(update.message, lang, user_id, response)
                 return
             
             else:
-                response = self.ai_agent.generate_response(user_message)
-                await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+                response = await self.ai_agent.agenerate_response(user_message)
+                await self._reply(update.message, lang, user_id, response)
         
         except Exception as e:
-            logger.error(f"Error handling message: {e}", exc_info=True)
-            await update.message.reply_text(
-                "I apologize, but I encountered an error processing your request. Could you please try again?",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
+            logger.error("Error handling message: %s", e, exc_info=True)
+            await self._reply(update.message, lang, user_id, "I apologize, but I encountered an error processing your request. Could you please try again?")
     
+    @requires_calendar
     async def handle_add_event(self, update: Update, context: ContextTypes.DEFAULT_TYPE, title: str = ""):
         """Start event creation flow with calendar picker"""
-        user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        if not self.calendar_enabled:
-            await update.message.reply_text(
-                "❌ Calendar features are disabled.",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
-            return
-        
-        context.user_data['flow'] = 'create_event'
+        start_flow(context.user_data, 'create_event')
         context.user_data['event_data'] = {'title': title} if title else {}
         
         # Show inline calendar picker
         today = datetime.date.today()
-        calendar_keyboard = self.generate_calendar_keyboard(today.year, today.month)
+        calendar_keyboard = self.generate_calendar_keyboard(today.year, today.month, self._lang(context))
         
         await update.message.reply_text(
             "📅 Select a date for your event:",
             reply_markup=calendar_keyboard
         )
     
+    @requires_calendar
     async def handle_upcoming(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show upcoming events"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        if not self.calendar_enabled:
-            await update.message.reply_text(
-                "❌ Calendar features are disabled.",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
-            return
-        
-        events = self.calendar_manager.get_upcoming_events(max_results=10)
+        lang = self._lang(context)
+        events = await self._get_upcoming_events(max_results=10)
         if events:
-            response = "📅 Your Upcoming Events:\n\n"
-            response += self.ai_agent.format_events_for_display(events)
+            response = f"📅 Your Upcoming Events:\n\n{self.ai_agent.format_events_for_display(events)}"
         else:
             response = "You have no upcoming events. Your schedule is clear! ✨"
         
-        await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+        await self._reply(update.message, lang, user_id, response)
     
+    @requires_calendar
     async def handle_today(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show today's events"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        if not self.calendar_enabled:
-            await update.message.reply_text(
-                "❌ Calendar features are disabled.",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
-            return
-        
+        lang = self._lang(context)
         today = datetime.date.today()
-        events = self.calendar_manager.get_events_for_date(today.isoformat())
+        today_pretty = f"{today:%B %d, %Y}"
+        events = await self._get_events_for_date(today)
         
         if events:
-            response = f"📋 Today's Schedule ({today.strftime('%B %d, %Y')}):\n\n"
-            response += self.ai_agent.format_events_for_display(events)
+            response = f"📋 Today's Schedule ({today_pretty}):\n\n{self.ai_agent.format_events_for_display(events)}"
         else:
-            response = f"No events scheduled for today ({today.strftime('%B %d, %Y')}). Enjoy your free day! 🌟"
+            response = f"No events scheduled for today ({today_pretty}). Enjoy your free day! 🌟"
         
-        await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+        await self._reply(update.message, lang, user_id, response)
     
     async def handle_search_request(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Request search query from user"""
-        context.user_data['flow'] = 'search'
+        start_flow(context.user_data, 'search')
         await update.message.reply_text(
             "🔍 Please enter your search query:",
-            reply_markup=ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
+            reply_markup=self._cancel_kb
         )
     
     async def handle_edit_request(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Request event name to edit"""
-        context.user_data['flow'] = 'edit'
+        start_flow(context.user_data, 'edit')
         await update.message.reply_text(
             "✏️ Please enter the name of the event you want to edit:",
-            reply_markup=ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
+            reply_markup=self._cancel_kb
         )
     
+    @requires_calendar
     async def handle_delete_request(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show delete options with inline buttons"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        if not self.calendar_enabled:
-            await update.message.reply_text(
-                "❌ Calendar features are disabled.",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
-            return
-        
-        events = self.calendar_manager.get_upcoming_events(max_results=10)
+        lang = self._lang(context)
+        events = await self._get_upcoming_events(max_results=10)
         if not events:
-            await update.message.reply_text(
-                "You have no upcoming events to delete.",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
+            await self._reply(update.message, lang, user_id, "You have no upcoming events to delete.")
             return
         
         response = "🗑️ Select an event to delete:\n\n"
-        keyboard = []
-        
-        for event in events[:10]:  # Limit to 10 events
-            event_id = event.get('id')
-            title = event.get('summary', 'Untitled')
-            start_time = event.get('start', 'N/A')
-            
-            button_text = f"🗑️ {title[:30]} - {start_time[:16]}"
-            keyboard.append([InlineKeyboardButton(button_text, callback_data=f"delete_{event_id}")])
-        
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
+        keyboard = [
+            [build_delete_button(event.get('id'), event.get('summary') or 'Untitled', event.get('start') or 'N/A')]
+            for event in events[:10]  # Limit to 10 events
+        ]
+        keyboard.append([_CANCEL_INLINE])
         
         await update.message.reply_text(
             response,
@@ -395,81 +649,56 @@ Type /menu anytime to show the main menu.
     
     async def handle_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
         """Handle ongoing user flows"""
-        user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        if user_message == "❌ Cancel":
-            context.user_data.clear()
-            await update.message.reply_text(
-                "❌ Cancelled.",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
-            return
-        
-        flow = context.user_data.get('flow')
-        
-        if flow == 'create_event':
-            await self.handle_create_event_flow(update, context, user_message)
-        elif flow == 'create_event_title':
-            await self.handle_create_event_with_title(update, context, user_message)
-        elif flow == 'search':
-            await self.handle_search_flow(update, context, user_message)
-        elif flow == 'delete':
-            await self.handle_delete_flow(update, context, user_message)
-        elif flow == 'edit':
-            await self.handle_edit_flow(update, context, user_message)
-        elif flow == 'add_task':
-            await self.handle_add_task_flow(update, context, user_message)
-        elif flow == 'add_note_title':
-            await self.handle_add_note_title_flow(update, context, user_message)
-        elif flow == 'add_note_content':
-            await self.handle_add_note_content_flow(update, context, user_message)
+        handler = self._flow_handlers.get(context.user_data.get('flow'))
+        if handler:
+            await handler(update, context, user_message)
     
     async def handle_create_event_with_title(self, update: Update, context: ContextTypes.DEFAULT_TYPE, title: str):
         """Create event with selected date/time and user-provided title"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         event_data = context.user_data.get('event_data', {})
         start_time = event_data.get('start_time')
         
         if not start_time:
-            await update.message.reply_text(
-                "❌ Error: No date/time selected. Please try again.",
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
+            await self._reply(update.message, lang, user_id, "❌ Error: No date/time selected. Please try again.")
             context.user_data.clear()
             return
         
         # Create the event
         end_time = start_time + datetime.timedelta(hours=1)  # Default 1 hour duration
         
-        await update.message.reply_text(
-            "⏳ Creating your event...",
-            reply_markup=ReplyKeyboardRemove()
-        )
-        
-        result = self.calendar_manager.create_event(
-            summary=title,
-            start_time=start_time,
-            end_time=end_time,
-            description="",
-            timezone="UTC"
+        # The typing indicator stands in for a separate progress message
+        result, _ = await asyncio.gather(
+            self._run(
+                self.calendar_manager.create_event,
+                summary=title,
+                start_time=start_time,
+                end_time=end_time,
+                description="",
+                timezone="UTC"
+            ),
+            update.message.chat.send_action(action="typing")
         )
         
         if result.get('success'):
-            response = f"✅ Event created successfully!\n\n"
-            response += f"📌 {title}\n"
-            response += f"📅 {start_time.strftime('%B %d, %Y')}\n"
-            response += f"⏰ {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}"
+            self._invalidate_calendar_cache()
+            response = (
+                f"✅ Event created successfully!\n\n"
+                f"📌 {title}\n"
+                f"📅 {start_time:%B %d, %Y}\n"
+                f"⏰ {start_time:%I:%M %p} - {end_time:%I:%M %p}"
+            )
         else:
             response = f"❌ Failed to create event: {result.get('error')}"
         
         context.user_data.clear()
-        await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+        await self._reply(update.message, lang, user_id, response)
     
     async def handle_create_event_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
         """Handle event creation flow"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         event_data = context.user_data.get('event_data', {})
         
         # Step 1: Get title
@@ -479,108 +708,95 @@ Type /menu anytime to show the main menu.
             await update.message.reply_text(
                 f"📌 Event: {user_message}\n\n"
                 "📅 Enter the date (e.g., 2025-11-25 or tomorrow):",
-                reply_markup=ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
+                reply_markup=self._cancel_kb
             )
             return
         
         # Step 2: Get date
         if 'date' not in event_data:
-            # Parse date
-            try:
-                if user_message.lower() == 'today':
-                    date = datetime.date.today()
-                elif user_message.lower() == 'tomorrow':
-                    date = datetime.date.today() + datetime.timedelta(days=1)
-                else:
-                    date = datetime.datetime.strptime(user_message, '%Y-%m-%d').date()
-                
-                event_data['date'] = date
-                context.user_data['event_data'] = event_data
-                await update.message.reply_text(
-                    f"📌 Event: {event_data['title']}\n"
-                    f"📅 Date: {date.strftime('%B %d, %Y')}\n\n"
-                    "⏰ Enter the time (e.g., 14:30 or 2:30 PM):",
-                    reply_markup=ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
-                )
-                return
-            except:
+            date = parse_event_date(user_message)
+            if date is None:
                 await update.message.reply_text(
                     "❌ Invalid date format. Please use YYYY-MM-DD (e.g., 2025-11-25) or type 'today' or 'tomorrow':",
-                    reply_markup=ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
+                    reply_markup=self._cancel_kb
                 )
                 return
+            
+            event_data['date'] = date
+            context.user_data['event_data'] = event_data
+            await update.message.reply_text(
+                f"📌 Event: {event_data['title']}\n"
+                f"📅 Date: {date:%B %d, %Y}\n\n"
+                "⏰ Enter the time (e.g., 14:30 or 2:30 PM):",
+                reply_markup=self._cancel_kb
+            )
+            return
         
         # Step 3: Get time and create event
         if 'time' not in event_data:
-            # Parse time
+            time_obj = parse_time_of_day(user_message)
+            if time_obj is None:
+                await update.message.reply_text(
+                    "❌ Invalid time format. Please use HH:MM format (e.g., 14:30 or 2:30 PM):",
+                    reply_markup=self._cancel_kb
+                )
+                return
+            
             try:
-                # Try different time formats
-                time_obj = None
-                for fmt in ['%H:%M', '%I:%M %p', '%I:%M%p', '%H%M']:
-                    try:
-                        time_obj = datetime.datetime.strptime(user_message.strip(), fmt).time()
-                        break
-                    except:
-                        continue
-                
-                if not time_obj:
-                    raise ValueError("Invalid time format")
-                
                 # Combine date and time
                 start_time = datetime.datetime.combine(event_data['date'], time_obj)
                 end_time = start_time + datetime.timedelta(hours=1)  # Default 1 hour duration
                 
                 # Create the event
-                await update.message.reply_text(
-                    "⏳ Creating your event...",
-                    reply_markup=ReplyKeyboardRemove()
-                )
-                
-                result = self.calendar_manager.create_event(
-                    summary=event_data['title'],
-                    start_time=start_time,
-                    end_time=end_time,
-                    description="",
-                    timezone="UTC"
+                # The typing indicator stands in for a separate progress message
+                result, _ = await asyncio.gather(
+                    self._run(
+                        self.calendar_manager.create_event,
+                        summary=event_data['title'],
+                        start_time=start_time,
+                        end_time=end_time,
+                        description="",
+                        timezone="UTC"
+                    ),
+                    update.message.chat.send_action(action="typing")
                 )
                 
                 if result.get('success'):
-                    response = f"✅ Event created successfully!\n\n"
-                    response += f"📌 {event_data['title']}\n"
-                    response += f"📅 {start_time.strftime('%B %d, %Y')}\n"
-                    response += f"⏰ {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}"
+                    self._invalidate_calendar_cache()
+                    response = (
+                        f"✅ Event created successfully!\n\n"
+                        f"📌 {event_data['title']}\n"
+                        f"📅 {start_time:%B %d, %Y}\n"
+                        f"⏰ {start_time:%I:%M %p} - {end_time:%I:%M %p}"
+                    )
                 else:
                     response = f"❌ Failed to create event: {result.get('error')}"
                 
                 context.user_data.clear()
-                await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+                await self._reply(update.message, lang, user_id, response)
                 
             except Exception as e:
-                logger.error(f"Error parsing time: {e}")
-                await update.message.reply_text(
-                    "❌ Invalid time format. Please use HH:MM format (e.g., 14:30 or 2:30 PM):",
-                    reply_markup=ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
-                )
-                return
+                logger.error("Error creating event: %s", e)
+                context.user_data.clear()
+                await self._reply(update.message, lang, user_id, "❌ Sorry, I encountered an error creating the event. Please try again.")
     
     async def handle_search_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
         """Handle search flow"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        events = self.calendar_manager.search_events(user_message)
+        lang = self._lang(context)
+        events = await self._run(self.calendar_manager.search_events, user_message)
         if events:
-            response = f"🔍 Found events matching '{user_message}':\n\n"
-            response += self.ai_agent.format_events_for_display(events)
+            response = f"🔍 Found events matching '{user_message}':\n\n{self.ai_agent.format_events_for_display(events)}"
         else:
             response = f"No events found matching '{user_message}'."
         
         context.user_data.clear()
-        await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+        await self._reply(update.message, lang, user_id, response)
     
     async def handle_delete_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
         """Handle delete flow"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         try:
             event_num = int(user_message) - 1
             events_list = context.user_data.get('events_list', [])
@@ -589,9 +805,10 @@ Type /menu anytime to show the main menu.
                 event = events_list[event_num]
                 event_id = event.get('id')
                 
-                result = self.calendar_manager.delete_event(event_id)
+                result = await self._run(self.calendar_manager.delete_event, event_id)
                 
                 if result.get('success'):
+                    self._invalidate_calendar_cache()
                     response = f"✅ Event deleted successfully!\n\n📌 {event.get('summary', 'Untitled')}"
                 else:
                     response = f"❌ Failed to delete event: {result.get('error')}"
@@ -599,22 +816,19 @@ Type /menu anytime to show the main menu.
                 response = "❌ Invalid event number. Please try again."
             
             context.user_data.clear()
-            await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+            await self._reply(update.message, lang, user_id, response)
             
         except ValueError:
             await update.message.reply_text(
                 "❌ Please enter a valid number:",
-                reply_markup=ReplyKeyboardMarkup([["❌ Cancel"]], resize_keyboard=True, one_time_keyboard=True)
+                reply_markup=self._cancel_kb
             )
     
     async def handle_edit_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
         """Handle edit flow"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        await update.message.reply_text(
-            get_text(lang, 'edit_coming_soon'),
-            reply_markup=self.get_main_menu_keyboard(lang, user_id)
-        )
+        lang = self._lang(context)
+        await self._reply(update.message, lang, user_id, get_text(lang, 'edit_coming_soon'))
         context.user_data.clear()
     
     async def show_language_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -633,18 +847,18 @@ Type /menu anytime to show the main menu.
     async def handle_add_task(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start task creation flow"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
-        context.user_data['flow'] = 'add_task'
+        start_flow(context.user_data, 'add_task')
         await update.message.reply_text(
             get_text(lang, 'add_task_title'),
-            reply_markup=ReplyKeyboardMarkup([[get_text(lang, 'btn_cancel')]], resize_keyboard=True, one_time_keyboard=True)
+            reply_markup=self.get_cancel_keyboard(lang)
         )
     
     async def handle_add_task_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
         """Handle task creation flow"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
         # Add the task
         result = self.task_note_manager.add_task(user_id, user_message)
@@ -655,20 +869,17 @@ Type /menu anytime to show the main menu.
             response = get_text(lang, 'error_occurred')
         
         context.user_data.clear()
-        await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+        await self._reply(update.message, lang, user_id, response)
     
     async def handle_list_tasks(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show user's tasks"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
         tasks = self.task_note_manager.get_tasks(user_id, include_completed=False)
         
         if not tasks:
-            await update.message.reply_text(
-                get_text(lang, 'no_tasks'),
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
+            await self._reply(update.message, lang, user_id, get_text(lang, 'no_tasks'))
             return
         
         # Create inline keyboard for tasks
@@ -691,59 +902,76 @@ Type /menu anytime to show the main menu.
     async def handle_add_note(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start note creation flow"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
-        context.user_data['flow'] = 'add_note_title'
+        start_flow(context.user_data, 'add_note_title')
         context.user_data['note_data'] = {}
         await update.message.reply_text(
             get_text(lang, 'add_note_title'),
-            reply_markup=ReplyKeyboardMarkup([[get_text(lang, 'btn_cancel')]], resize_keyboard=True, one_time_keyboard=True)
+            reply_markup=self.get_cancel_keyboard(lang)
         )
     
     async def handle_add_note_title_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
         """Handle note title input"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
         context.user_data['note_data']['title'] = user_message
-        context.user_data['flow'] = 'add_note_content'
+        start_flow(context.user_data, 'add_note_content')
         
         await update.message.reply_text(
             get_text(lang, 'add_note_content'),
-            reply_markup=ReplyKeyboardMarkup([[get_text(lang, 'btn_cancel')]], resize_keyboard=True, one_time_keyboard=True)
+            reply_markup=self.get_cancel_keyboard(lang)
         )
     
     async def handle_add_note_content_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_message: str):
-        """Handle note content input and create note"""
+        """Handle note content input; the note is created once NOTE_DEBOUNCE_SECONDS have passed"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
-        
-        note_data = context.user_data.get('note_data', {})
-        title = note_data.get('title', 'Untitled')
         
-        # Add the note
-        result = self.task_note_manager.add_note(user_id, title, user_message)
+        # A later part of a split message joins the buffer the first part's timer saves
+        parts = self._note_buffers.get(user_id)
+        if parts is not None:
+            parts.append(user_message)
+            return
         
-        if result['success']:
-            response = get_text(lang, 'note_added', title=title)
-        else:
-            response = get_text(lang, 'error_occurred')
+        self._note_buffers[user_id] = [user_message]
+        context.application.create_task(self._save_buffered_note(update, context), update=update)
+    
+    async def _save_buffered_note(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Create the note from the buffered content parts after the debounce window"""
+        await asyncio.sleep(NOTE_DEBOUNCE_SECONDS)
+        user_id = update.effective_user.id
         
-        context.user_data.clear()
-        await update.message.reply_text(response, reply_markup=self.get_main_menu_keyboard(lang, user_id))
+        async with self._chat_lock(update.effective_chat.id):
+            parts = self._note_buffers.pop(user_id, None)
+            # The user cancelled or left the flow while the parts were being collected
+            if not parts or context.user_data.get('flow') != 'add_note_content':
+                return
+            
+            lang = self._lang(context)
+            note_data = context.user_data.get('note_data', {})
+            title = note_data.get('title', 'Untitled')
+            
+            # Add the note
+            result = self.task_note_manager.add_note(user_id, title, "\n".join(parts))
+            
+            if result['success']:
+                response = get_text(lang, 'note_added', title=title)
+            else:
+                response = get_text(lang, 'error_occurred')
+            
+            context.user_data.clear()
+            await self._reply(update.message, lang, user_id, response)
     
     async def handle_list_notes(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show user's notes"""
         user_id = update.effective_user.id
-        lang = get_user_language(user_id, context.user_data)
+        lang = self._lang(context)
         
         notes = self.task_note_manager.get_notes(user_id)
         
         if not notes:
-            await update.message.reply_text(
-                get_text(lang, 'no_notes'),
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
+            await self._reply(update.message, lang, user_id, get_text(lang, 'no_notes'))
             return
         
         # Create inline keyboard for notes
@@ -760,8 +988,19 @@ Type /menu anytime to show the main menu.
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
     
-    def generate_calendar_keyboard(self, year: int, month: int):
-        """Generate inline calendar keyboard for date selection"""
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def generate_calendar_keyboard(year: int, month: int, lang: str = 'en'):
+        """Generate inline calendar keyboard for date selection (shared between users)
+
+        Args:
+            year: Year to show
+            month: Month to show (1-12)
+            lang: Language code for the cancel button
+
+        Returns:
+            InlineKeyboardMarkup, cached per (year, month, lang)
+        """
         keyboard = []
         
         # Month and year header with navigation
@@ -773,47 +1012,61 @@ Type /menu anytime to show the main menu.
         ])
         
         # Day names header
-        keyboard.append([InlineKeyboardButton(day, callback_data="cal_ignore") 
-                        for day in ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]])
-        
-        # Calendar days
-        month_calendar = cal_module.monthcalendar(year, month)
-        for week in month_calendar:
-            row = []
-            for day in week:
-                if day == 0:
-                    row.append(InlineKeyboardButton(" ", callback_data="cal_ignore"))
-                else:
-                    row.append(InlineKeyboardButton(
-                        str(day),
-                        callback_data=f"cal_day_{year}_{month}_{day}"
-                    ))
-            keyboard.append(row)
+        keyboard.append(_DAY_HEADER_ROW)
+        
+        # Calendar days, in Monday-first weeks padded with blank cells
+        first_weekday, days_in_month = cal_module.monthrange(year, month)
+        cells = [_EMPTY_CELL] * first_weekday
+        cells.extend(
+            InlineKeyboardButton(str(day), callback_data=f"cal_day_{year}_{month}_{day}")
+            for day in range(1, days_in_month + 1)
+        )
+        cells.extend([_EMPTY_CELL] * (-len(cells) % 7))
+        for start in range(0, len(cells), 7):
+            keyboard.append(cells[start:start + 7])
         
         # Cancel button
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
+        keyboard.append([InlineKeyboardButton(get_text(lang, 'btn_cancel'), callback_data="cal_cancel")])
         
         return InlineKeyboardMarkup(keyboard)
     
-    def generate_time_keyboard(self):
-        """Generate inline keyboard for time selection"""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def generate_common_time_keyboard():
+        """Generate inline keyboard of common half-hour slots, picked in a single tap (shared between users)"""
+        slots = [
+            InlineKeyboardButton(f"{minutes // 60:02d}:{minutes % 60:02d}", callback_data=f"time_{minutes // 60}_{minutes % 60}")
+            for minutes in range(8 * 60, 20 * 60 + 1, 30)
+        ]
+        keyboard = [slots[start:start + 5] for start in range(0, len(slots), 5)]
+        keyboard.append([InlineKeyboardButton("🕐 Other time", callback_data="time_other")])
+        keyboard.append([_CANCEL_INLINE])
+        
+        return InlineKeyboardMarkup(keyboard)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def generate_time_keyboard():
+        """Generate inline keyboard for hour selection, followed by the minute picker (shared between users)"""
         keyboard = []
         
-        # Hours in rows of 4
+        # Hours in rows of 3
         hours = []
         for hour in range(0, 24, 3):
             row = []
             for h in range(hour, min(hour + 3, 24)):
-                row.append(InlineKeyboardButton(f"{h:02d}:00", callback_data=f"time_{h}_0"))
+                row.append(InlineKeyboardButton(f"{h:02d}:__", callback_data=f"time_{h}"))
             hours.append(row)
         
         keyboard.extend(hours)
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
+        keyboard.append([_CANCEL_INLINE])
         
         return InlineKeyboardMarkup(keyboard)
     
-    def generate_minute_keyboard(self, hour: int):
-        """Generate inline keyboard for minute selection"""
+    @staticmethod
+    @functools.lru_cache(maxsize=24)
+    def generate_minute_keyboard(hour: int):
+        """Generate inline keyboard for minute selection (shared between users)"""
         keyboard = []
         
         # Minutes in 15-minute intervals
@@ -826,34 +1079,22 @@ Type /menu anytime to show the main menu.
         keyboard.append(row)
         
         keyboard.append([InlineKeyboardButton("🔙 Back to Hours", callback_data="time_back")])
-        keyboard.append([InlineKeyboardButton("❌ Cancel", callback_data="cal_cancel")])
+        keyboard.append([_CANCEL_INLINE])
         
         return InlineKeyboardMarkup(keyboard)
     
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle inline button callbacks"""
+        """Handle inline button callbacks, one at a time per chat"""
+        await update.callback_query.answer()
+        async with self._chat_lock(update.effective_chat.id):
+            await self._handle_callback(update, context)
+    
+    async def _handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route an inline button callback to its handler"""
         query = update.callback_query
-        await query.answer()
-        
         data = query.data
         user_id = query.from_user.id
-        lang = get_user_language(user_id, context.user_data)
-        
-        # Language selection
-        if data.startswith("lang_"):
-            new_lang = data.replace("lang_", "")
-            set_user_language(context.user_data, new_lang)
-            lang = new_lang
-            
-            await query.edit_message_text(
-                get_text(lang, 'language_changed'),
-                reply_markup=None
-            )
-            await query.message.reply_text(
-                get_text(lang, 'use_menu'),
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
-            return
+        lang = self._lang(context)
         
         # Ignore placeholder buttons
         if data == "cal_ignore":
@@ -866,176 +1107,161 @@ Type /menu anytime to show the main menu.
                 get_text(lang, 'cancelled'),
                 reply_markup=None
             )
-            await query.message.reply_text(
-                get_text(lang, 'use_menu'),
-                reply_markup=self.get_main_menu_keyboard(lang, user_id)
-            )
+            await self._reply(query.message, lang, user_id, get_text(lang, 'use_menu'))
             return
         
-        # Calendar navigation
-        if data.startswith("cal_prev_"):
-            _, _, year, month = data.split("_")
-            year, month = int(year), int(month)
-            month -= 1
-            if month < 1:
-                month = 12
-                year -= 1
-            keyboard = self.generate_calendar_keyboard(year, month)
-            await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
-            return
-        
-        if data.startswith("cal_next_"):
-            _, _, year, month = data.split("_")
-            year, month = int(year), int(month)
-            month += 1
-            if month > 12:
-                month = 1
-                year += 1
-            keyboard = self.generate_calendar_keyboard(year, month)
-            await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
-            return
-        
-        # Date selection
-        if data.startswith("cal_day_"):
-            _, _, year, month, day = data.split("_")
-            selected_date = datetime.date(int(year), int(month), int(day))
-            
-            context.user_data['event_data']['date'] = selected_date
-            
-            # Show time picker
+        # Full hour picker, for times outside the common slots
+        if data == "time_other" or data == "time_back":
             time_keyboard = self.generate_time_keyboard()
             await query.edit_message_text(
-                f"📅 Date: {selected_date.strftime('%B %d, %Y')}\n\n⏰ Select a time:",
+                f"📅 Date: {context.user_data['event_data']['date']:%B %d, %Y}\n\n⏰ Select a time:",
                 reply_markup=time_keyboard
             )
             return
         
-        # Time selection
-        if data.startswith("time_"):
-            if data == "time_back":
-                time_keyboard = self.generate_time_keyboard()
-                await query.edit_message_text(
-                    f"📅 Date: {context.user_data['event_data']['date'].strftime('%B %d, %Y')}\n\n⏰ Select a time:",
-                    reply_markup=time_keyboard
-                )
-                return
-            
-            parts = data.split("_")
-            hour = int(parts[1])
-            minute = int(parts[2]) if len(parts) > 2 else None
-            
-            if minute is None:
-                # Show minute picker
-                minute_keyboard = self.generate_minute_keyboard(hour)
-                await query.edit_message_text(
-                    f"📅 Date: {context.user_data['event_data']['date'].strftime('%B %d, %Y')}\n\n"
-                    f"⏰ Select minutes for {hour:02d}:__",
-                    reply_markup=minute_keyboard
-                )
-                return
-            
-            # Time fully selected, ask for title
-            selected_date = context.user_data['event_data']['date']
-            selected_time = datetime.datetime.combine(selected_date, datetime.time(hour, minute))
-            context.user_data['event_data']['start_time'] = selected_time
-            
+        # Everything else is "<action>_<payload>"
+        match = _CALLBACK_RE.match(data)
+        if match:
+            handler = self._callback_handlers[match.group(1)]
+            await handler(query, context, lang, user_id, match.group(2))
+    
+    async def _cb_language(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Switch the interface language (lang_<code>)"""
+        lang = payload
+        set_user_language(context.user_data, lang)
+        
+        await query.edit_message_text(
+            get_text(lang, 'language_changed'),
+            reply_markup=None
+        )
+        await self._reply(query.message, lang, user_id, get_text(lang, 'use_menu'))
+    
+    async def _cb_cal_prev(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Show the previous month (cal_prev_<year>_<month>)"""
+        await self._show_calendar_month(query, payload, -1, lang)
+    
+    async def _cb_cal_next(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Show the next month (cal_next_<year>_<month>)"""
+        await self._show_calendar_month(query, payload, 1, lang)
+    
+    async def _show_calendar_month(self, query, payload: str, delta: int, lang: str):
+        """Move the date picker delta months away from the <year>_<month> in payload"""
+        year, month = payload.split("_")
+        year, month = int(year), int(month) + delta
+        if month < 1:
+            month = 12
+            year -= 1
+        elif month > 12:
+            month = 1
+            year += 1
+        keyboard = self.generate_calendar_keyboard(year, month, lang)
+        await query.edit_message_text("📅 Select a date for your event:", reply_markup=keyboard)
+    
+    async def _cb_cal_day(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Store the picked date and show the common time slots (cal_day_<year>_<month>_<day>)"""
+        year, month, day = payload.split("_")
+        selected_date = datetime.date(int(year), int(month), int(day))
+        
+        context.user_data['event_data']['date'] = selected_date
+        
+        # Show time picker
+        time_keyboard = self.generate_common_time_keyboard()
+        await query.edit_message_text(
+            f"📅 Date: {selected_date:%B %d, %Y}\n\n⏰ Select a time:",
+            reply_markup=time_keyboard
+        )
+    
+    async def _cb_time(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Show the minute picker, or store the start time and ask for a title (time_<hour>[_<minute>])"""
+        parts = payload.split("_")
+        hour = int(parts[0])
+        minute = int(parts[1]) if len(parts) > 1 else None
+        
+        if minute is None:
+            # Show minute picker
+            minute_keyboard = self.generate_minute_keyboard(hour)
             await query.edit_message_text(
-                f"✅ Date & Time: {selected_time.strftime('%B %d, %Y at %I:%M %p')}\n\n"
-                "📝 Please type the event title/description:"
+                f"📅 Date: {context.user_data['event_data']['date']:%B %d, %Y}\n\n"
+                f"⏰ Select minutes for {hour:02d}:__",
+                reply_markup=minute_keyboard
             )
-            context.user_data['flow'] = 'create_event_title'
             return
         
-        # Delete event with inline buttons
-        if data.startswith("delete_"):
-            event_id = data.replace("delete_", "")
-            result = self.calendar_manager.delete_event(event_id)
-            
-            if result.get('success'):
-                await query.edit_message_text("✅ Event deleted successfully!")
-                await query.message.reply_text(
-                    "Use the menu below:",
-                    reply_markup=self.get_main_menu_keyboard(lang, user_id)
-                )
-            else:
-                await query.edit_message_text(f"❌ Failed to delete event: {result.get('error')}")
-                await query.message.reply_text(
-                    "Use the menu below:",
-                    reply_markup=self.get_main_menu_keyboard(lang, user_id)
-                )
-            context.user_data.clear()
-            return
+        # Time fully selected, ask for title
+        selected_date = context.user_data['event_data']['date']
+        selected_time = datetime.datetime.combine(selected_date, datetime.time(hour, minute))
+        context.user_data['event_data']['start_time'] = selected_time
         
-        # Task actions
-        if data.startswith("task_complete_"):
-            task_id = int(data.replace("task_complete_", ""))
-            result = self.task_note_manager.complete_task(user_id, task_id)
-            
-            if result.get('success'):
-                task = result['task']
-                await query.edit_message_text(
-                    get_text(lang, 'task_completed', title=task['title'])
-                )
-                await query.message.reply_text(
-                    get_text(lang, 'use_menu'),
-                    reply_markup=self.get_main_menu_keyboard(lang, user_id)
-                )
-            else:
-                await query.edit_message_text(f"❌ {result.get('error')}")
-            return
+        await query.edit_message_text(
+            f"✅ Date & Time: {selected_time:%B %d, %Y at %I:%M %p}\n\n"
+            "📝 Please type the event title/description:"
+        )
+        start_flow(context.user_data, 'create_event_title')
+    
+    async def _cb_delete_event(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Delete a calendar event (delete_<event id>)"""
+        result = await self._run(self.calendar_manager.delete_event, payload)
         
-        if data.startswith("task_delete_"):
-            task_id = int(data.replace("task_delete_", ""))
-            result = self.task_note_manager.delete_task(user_id, task_id)
-            
-            if result.get('success'):
-                task = result['task']
-                await query.edit_message_text(
-                    get_text(lang, 'task_deleted', title=task['title'])
-                )
-                await query.message.reply_text(
-                    get_text(lang, 'use_menu'),
-                    reply_markup=self.get_main_menu_keyboard(lang, user_id)
-                )
-            else:
-                await query.edit_message_text(f"❌ {result.get('error')}")
-            return
+        if result.get('success'):
+            self._invalidate_calendar_cache()
+            await query.edit_message_text("✅ Event deleted successfully!")
+        else:
+            await query.edit_message_text(f"❌ Failed to delete event: {result.get('error')}")
+        await self._reply(query.message, lang, user_id, "Use the menu below:")
+        context.user_data.clear()
+    
+    async def _cb_task_complete(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Mark a task as completed (task_complete_<task id>)"""
+        result = self.task_note_manager.complete_task(user_id, int(payload))
         
-        # Note actions
-        if data.startswith("note_view_"):
-            note_id = int(data.replace("note_view_", ""))
-            note = self.task_note_manager.get_note(user_id, note_id)
-            
-            if note:
-                created_date = datetime.datetime.fromisoformat(note['created_at']).strftime('%B %d, %Y')
-                content = note.get('content', 'No content')
-                await query.edit_message_text(
-                    get_text(lang, 'note_content', title=note['title'], content=content, date=created_date)
-                )
-                await query.message.reply_text(
-                    get_text(lang, 'use_menu'),
-                    reply_markup=self.get_main_menu_keyboard(lang, user_id)
-                )
-            else:
-                await query.edit_message_text("❌ Note not found")
-            return
+        if result.get('success'):
+            task = result['task']
+            await query.edit_message_text(
+                get_text(lang, 'task_completed', title=task['title'])
+            )
+            await self._reply(query.message, lang, user_id, get_text(lang, 'use_menu'))
+        else:
+            await query.edit_message_text(f"❌ {result.get('error')}")
+    
+    async def _cb_task_delete(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Delete a task (task_delete_<task id>)"""
+        result = self.task_note_manager.delete_task(user_id, int(payload))
         
-        if data.startswith("note_delete_"):
-            note_id = int(data.replace("note_delete_", ""))
-            result = self.task_note_manager.delete_note(user_id, note_id)
-            
-            if result.get('success'):
-                note = result['note']
-                await query.edit_message_text(
-                    get_text(lang, 'note_deleted', title=note['title'])
-                )
-                await query.message.reply_text(
-                    get_text(lang, 'use_menu'),
-                    reply_markup=self.get_main_menu_keyboard(lang, user_id)
-                )
-            else:
-                await query.edit_message_text(f"❌ {result.get('error')}")
-            return
+        if result.get('success'):
+            task = result['task']
+            await query.edit_message_text(
+                get_text(lang, 'task_deleted', title=task['title'])
+            )
+            await self._reply(query.message, lang, user_id, get_text(lang, 'use_menu'))
+        else:
+            await query.edit_message_text(f"❌ {result.get('error')}")
+    
+    async def _cb_note_view(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Show a note (note_view_<note id>)"""
+        note = self.task_note_manager.get_note(user_id, int(payload))
+        
+        if note:
+            created_date = f"{datetime.datetime.fromisoformat(note['created_at']):%B %d, %Y}"
+            content = note.get('content', 'No content')
+            await query.edit_message_text(
+                get_text(lang, 'note_content', title=note['title'], content=content, date=created_date)
+            )
+            await self._reply(query.message, lang, user_id, get_text(lang, 'use_menu'))
+        else:
+            await query.edit_message_text("❌ Note not found")
+    
+    async def _cb_note_delete(self, query, context: ContextTypes.DEFAULT_TYPE, lang: str, user_id: int, payload: str):
+        """Delete a note (note_delete_<note id>)"""
+        result = self.task_note_manager.delete_note(user_id, int(payload))
+        
+        if result.get('success'):
+            note = result['note']
+            await query.edit_message_text(
+                get_text(lang, 'note_deleted', title=note['title'])
+            )
+            await self._reply(query.message, lang, user_id, get_text(lang, 'use_menu'))
+        else:
+            await query.edit_message_text(f"❌ {result.get('error')}")
     
     def run(self):
         """Start the bot"""
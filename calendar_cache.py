@@ -0,0 +1,66 @@
+"""
+Calendar Read Cache Module
+Short-lived cache of Cal.com reads shared by both Telegram bot front-ends
+"""
+import time
+import asyncio
+from typing import Callable, Dict, Hashable, Tuple
+
+# Entry count at which expired reads are swept out (search keys are open-ended)
+CALENDAR_CACHE_MAX = 256
+
+
+class CalendarCache:
+    """Reuses blocking calendar reads for a few seconds, sharing in-flight fetches between callers"""
+
+    def __init__(self, ttl: float, max_size: int = CALENDAR_CACHE_MAX):
+        self.ttl = ttl
+        self.max_size = max_size
+        # key -> (expiry, future shared by concurrent callers)
+        self._entries: Dict[Hashable, Tuple[float, asyncio.Future]] = {}
+
+    async def call(self, key: Hashable, func: Callable, *args, **kwargs):
+        """
+        Run a blocking calendar read in a worker thread, reusing the result for ttl seconds
+
+        Concurrent callers with the same key await the same in-flight fetch; a
+        failed fetch is not cached.
+
+        Args:
+            key: Cache key identifying the read (e.g. ('date', date))
+            func: Blocking function to run, such as a CalendarManager method
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            The result of func
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= now:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_size:
+                self._evict(now)
+            future = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+            entry = (now + self.ttl, future)
+            self._entries[key] = entry
+
+        try:
+            # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+            return await asyncio.shield(entry[1])
+        except Exception:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            raise
+
+    def _evict(self, now: float):
+        """Drop expired reads, then the oldest ones while the cache is still full"""
+        self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+        while len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+    def clear(self):
+        """Drop every cached read, e.g. after a booking is created, changed or deleted"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
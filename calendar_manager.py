@@ -5,6 +5,7 @@ Handles all calendar operations including creating, reading, updating events and
 import datetime
 from typing import List, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
 import pytz
 from config import CALCOM_API_KEY, CALCOM_API_URL
 
@@ -19,6 +20,12 @@ class CalendarManager:
         self.headers = {
             "Content-Type": "application/json"
         }
+        # One pooled session keeps TLS connections to Cal.com alive between calls;
+        # the pool is sized for the bot's concurrent worker-thread requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=20)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.is_authenticated = self.authenticate()
     
     def is_connected(self):
@@ -37,7 +44,7 @@ class CalendarManager:
                 return False
             
             # Test API connection by fetching user profile
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/me",
                 headers=self.headers,
                 params={"apiKey": self.api_key},
@@ -81,7 +88,7 @@ class CalendarManager:
         
         try:
             # Get user profile to fetch username and default calendar
-            user_response = requests.get(
+            user_response = self.session.get(
                 f"{self.api_url}/me",
                 headers=self.headers,
                 params={"apiKey": self.api_key},
@@ -96,7 +103,7 @@ class CalendarManager:
             username = user_data.get('username', 'user')
             
             # First, get the user's event types to use the first available one
-            event_types_response = requests.get(
+            event_types_response = self.session.get(
                 f"{self.api_url}/event-types",
                 headers=self.headers,
                 params={"apiKey": self.api_key},
@@ -140,7 +147,7 @@ class CalendarManager:
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/bookings",
                 headers=self.headers,
                 params={"apiKey": self.api_key},
@@ -191,7 +198,7 @@ class CalendarManager:
         
         try:
             # Get bookings from Cal.com
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/bookings",
                 headers=self.headers,
                 params={"apiKey": self.api_key, "take": max_results, "status": "upcoming"},
@@ -280,7 +287,7 @@ class CalendarManager:
             if end_time:
                 update_data['endTime'] = end_time.isoformat()
             
-            response = requests.patch(
+            response = self.session.patch(
                 f"{self.api_url}/bookings/{event_id}",
                 headers=self.headers,
                 params={"apiKey": self.api_key},
@@ -325,7 +332,7 @@ class CalendarManager:
             }
             
             # First try the cancel endpoint
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/bookings/{event_id}/cancel",
                 headers=self.headers,
                 params={"apiKey": self.api_key},
@@ -335,7 +342,7 @@ class CalendarManager:
             
             # If cancel endpoint doesn't work, try delete
             if response.status_code not in [200, 201, 204]:
-                response = requests.delete(
+                response = self.session.delete(
                     f"{self.api_url}/bookings/{event_id}",
                     headers=self.headers,
                     params={"apiKey": self.api_key},
@@ -378,7 +385,7 @@ class CalendarManager:
         """
         try:
             # Get all bookings and filter client-side
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/bookings",
                 headers=self.headers,
                 params={"apiKey": self.api_key, "take": 100},  # Get more to search through
@@ -446,7 +453,7 @@ class CalendarManager:
             time_max = datetime.datetime.combine(date, datetime.time.max)
             
             # Get all bookings and filter by date
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/bookings",
                 headers=self.headers,
                 params={"apiKey": self.api_key, "take": 100},
@@ -19,6 +19,9 @@ GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 CALCOM_API_KEY = os.getenv('CALCOM_API_KEY')
 CALCOM_API_URL = os.getenv('CALCOM_API_URL', 'https://api.cal.com/v1')
 
+# Bot state (per-user flow data) survives restarts in this pickle file
+PERSISTENCE_FILE = os.getenv('PERSISTENCE_FILE', 'data/bot_state.pickle')
+
 # Bot Settings
 BOT_NAME = "Smart Calendar Assistant"
 BOT_VERSION = "1.0.0"
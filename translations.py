@@ -2,6 +2,7 @@
 Language translations for the bot
 Supports English and Persian (Farsi)
 """
+import functools
 
 LANGUAGES = {
     'en': {
@@ -224,6 +225,14 @@ Ask me questions, have a conversation, or just say hello! 👋
 }
 
 
+@functools.lru_cache(maxsize=4096)
+def _get_template(lang_code: str, key: str) -> str:
+    """Resolve the text for (lang_code, key) with the English and key fallbacks applied"""
+    # Default to English if language not found
+    lang = LANGUAGES.get(lang_code, LANGUAGES['en'])
+    return lang.get(key, LANGUAGES['en'].get(key, key))
+
+
 def get_text(lang_code: str, key: str, **kwargs) -> str:
     """
     Get translated text for a given language code and key
@@ -236,14 +245,12 @@ def get_text(lang_code: str, key: str, **kwargs) -> str:
     Returns:
         Translated text
     """
-    # Default to English if language not found
-    lang = LANGUAGES.get(lang_code, LANGUAGES['en'])
-    text = lang.get(key, LANGUAGES['en'].get(key, key))
+    text = _get_template(lang_code, key)
     
     # Format if kwargs provided
     if kwargs:
         try:
-            text = text.format(**kwargs)
+            text = text.format_map(kwargs)
         except KeyError:
             pass
     